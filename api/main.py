@@ -3,28 +3,25 @@
 Main FastAPI application for Moroccan Court of Accounts Scraper API
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse, PlainTextResponse
+from starlette.datastructures import Headers
 import os
-import sys
+import logging
+import hashlib
+import mimetypes
+from email.utils import formatdate
 from pathlib import Path
 
-# Add the current directory to Python path for local development
-current_dir = Path(__file__).parent
-sys.path.insert(0, str(current_dir))
+import orjson
 
-# Import the court_accounts router
-try:
-    from routes import court_accounts
-    print("✅ Successfully imported court_accounts from routes")
-except ImportError as e:
-    print(f"❌ Error importing from routes: {e}")
-    # Create a minimal router for testing
-    from fastapi import APIRouter
-    court_accounts = APIRouter()
-    print("⚠️ Using fallback router")
+from api.routes import court_accounts
+
+# Quiet by default in production; set LOG_LEVEL=DEBUG to see per-request logs
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper())
+logger = logging.getLogger(__name__)
 
 # Create FastAPI app
 app = FastAPI(
@@ -33,9 +30,13 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
+# Compress JSON/HTML responses (added before CORS so CORS stays outermost)
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -45,40 +46,112 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class PreloadedStatic:
+    """ASGI app serving a small, immutable asset directory from memory
+    
+    Every file is read once at startup into ``path -> (bytes, content type,
+    etag, last modified)``, so requests never touch the filesystem.
+    """
+    
+    # Assets are not fingerprinted, so keep max-age modest; once it expires
+    # the ETag/Last-Modified headers give cheap 304s
+    cache_control = "public, max-age=86400"
+    
+    def __init__(self, directory):
+        self.files = {}
+        root = Path(directory)
+        for file_path in root.rglob("*"):
+            if not file_path.is_file():
+                continue
+            content = file_path.read_bytes()
+            content_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+            etag = f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+            last_modified = formatdate(file_path.stat().st_mtime, usegmt=True)
+            self.files["/" + file_path.relative_to(root).as_posix()] = (content, content_type, etag, last_modified)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            # Mount forwards websocket scopes too; refuse the handshake
+            if scope["type"] == "websocket":
+                await send({"type": "websocket.close", "code": 1000})
+            return
+        if scope["method"] not in ("GET", "HEAD"):
+            response = PlainTextResponse("Method Not Allowed", status_code=405)
+        else:
+            # Mount has already stripped its prefix (moved into root_path)
+            entry = self.files.get(scope["path"])
+            if entry is None:
+                response = PlainTextResponse("Not Found", status_code=404)
+            else:
+                content, content_type, etag, last_modified = entry
+                headers = {"ETag": etag, "Last-Modified": last_modified, "Cache-Control": self.cache_control}
+                if etag in Headers(scope=scope).get("if-none-match", ""):
+                    response = Response(status_code=304, headers=headers)
+                else:
+                    response = Response(content, media_type=content_type, headers=headers)
+        await response(scope, receive, send)
+
 # Mount static files (CSS, JS, images)
-public_dir = Path(__file__).parent.parent / "public"
-app.mount("/css", StaticFiles(directory=str(public_dir / "css")), "css")
-app.mount("/js", StaticFiles(directory=str(public_dir / "js")), "js")
+public_dir = Path(__file__).resolve().parent.parent / "public"
+app.mount("/css", PreloadedStatic(public_dir / "css"), "css")
+app.mount("/js", PreloadedStatic(public_dir / "js"), "js")
 
 # Include API routers
 app.include_router(court_accounts.router, prefix="/api")
-print(f"✅ Router included: {court_accounts.router}")
+
+@app.on_event("shutdown")
+async def close_scraper_service():
+    """Close the scraper service's pooled HTTP session, if one was created"""
+    await court_accounts.close_scraper_service()
+
+# Read the frontend page once at import instead of on every request
+_INDEX_FILE = public_dir / "index.html"
+_INDEX_HTML = _INDEX_FILE.read_bytes() if _INDEX_FILE.exists() else None
+_INDEX_ETAG = (
+    f'"{hashlib.blake2b(_INDEX_HTML, digest_size=16).hexdigest()}"'
+    if _INDEX_HTML is not None else None
+)
+_INDEX_HEADERS = {"ETag": _INDEX_ETAG, "Cache-Control": "no-cache"} if _INDEX_ETAG else {}
 
 # Root endpoint for the main page (serves the frontend directly)
 @app.get("/")
-async def main_page():
+async def main_page(request: Request):
     """Main page endpoint - serves the frontend directly"""
-    # Read the HTML file from public directory
-    html_file = public_dir / "index.html"
-    
-    if html_file.exists():
-        with open(html_file, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        return HTMLResponse(content=html_content, status_code=200)
+    # A fresh response object per request: middleware (e.g. GZip) rewrites
+    # response headers in place, so the cached part is the body bytes only
+    if _INDEX_HTML is not None:
+        if_none_match = request.headers.get("if-none-match", "")
+        if _INDEX_ETAG in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=_INDEX_HEADERS)
+        return HTMLResponse(content=_INDEX_HTML, status_code=200, headers=_INDEX_HEADERS)
     else:
         return HTMLResponse(content="<h1>Frontend not found</h1>", status_code=404)
 
+# Static JSON bodies, serialized once at import
+_HEALTH_BYTES = orjson.dumps({"status": "healthy", "service": "Court of Accounts Scraper API"})
+_TEST_BYTES = orjson.dumps({"message": "Test endpoint working!"})
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "Court of Accounts Scraper API"}
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 # Test endpoint
 @app.get("/test")
 async def test():
     """Test endpoint"""
-    return {"message": "Test endpoint working!"}
+    return Response(content=_TEST_BYTES, media_type="application/json")
+
+# Warm caches at import: Vercel imports this module once per container and
+# serves `app` directly through its native ASGI runtime, so everything
+# expensive happens here rather than in startup events or on the first request
+court_accounts.load_publications_data()
+try:
+    court_accounts.init_scraper_service()
+except Exception as e:
+    # /scrape retries the construction and reports the error to the caller
+    logger.error("❌ Error initializing scraper service: %s", e)
 
 # Note: FastAPI automatically generates /docs and /redoc endpoints
 # based on the docs_url and redoc_url configuration above
@@ -3,104 +3,151 @@
 Court of Accounts API routes
 """
 
-from fastapi import APIRouter, Query, HTTPException, Body
+from fastapi import APIRouter, Query, HTTPException, Body, Response, BackgroundTasks
 from typing import List, Optional, Dict, Any
 import json
 from pathlib import Path
-import sys
 import os
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Data files at least this large are stream-parsed with ijson (when it is
+# installed) so only the "data" array is materialized; below it a single
+# orjson.loads of the whole file is faster
+STREAM_PARSE_MIN_BYTES = 50 * 1024 * 1024
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Parsed publications keyed on the data file's mtime, so repeat requests
+# skip re-reading and re-parsing the JSON until the file changes. The
+# year/category indexes, category set and the serialized unfiltered
+# /publications body are derived once per parse.
+_PUB_CACHE = {
+    "mtime": None,
+    "data": None,
+    "by_year": {},
+    "by_category": {},
+    "by_year_category": {},
+    "categories": frozenset(),
+    "all_response": None,
+}
+_PUB_CACHE_LOCK = threading.Lock()
+
+# Scraper service, constructed once per process
+_SERVICE_SINGLETON = None
+_SERVICE_LOCK = asyncio.Lock()
+
+# Simplified path handling for Vercel: resolved once at import
+# Navigate up from api/routes to project root
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DATA_FILE = PROJECT_ROOT / "data" / "court-accounts-publications-2025.json"
 
-# Simplified path handling for Vercel
 def get_project_root():
     """Get the project root directory"""
-    current_file = Path(__file__)
-    # Navigate up from api/routes to project root
-    return current_file.parent.parent.parent
+    return PROJECT_ROOT
 
-def load_publications_data():
-    """Load publications data from JSON file"""
+def _build_publication_indexes(publications):
+    """Build the per-year, per-category and per-(year, category) indexes"""
+    by_year = defaultdict(list)
+    by_category = defaultdict(list)
+    by_year_category = defaultdict(list)
+    
+    for pub in publications:
+        year = pub.get("year")
+        category = pub.get("category")
+        by_year[year].append(pub)
+        by_category[category].append(pub)
+        by_year_category[(year, category)].append(pub)
+    
+    return {
+        "by_year": dict(by_year),
+        "by_category": dict(by_category),
+        "by_year_category": dict(by_year_category),
+        "categories": frozenset(c for c in by_category if c),
+        "all_response": _json_dumps({
+            "success": True,
+            "publications": publications,
+            "count": len(publications)
+        }),
+    }
+
+def _parse_publications_file(size):
+    """Parse the publications list out of the data file"""
+    if ijson is not None and size >= STREAM_PARSE_MIN_BYTES:
+        with open(DATA_FILE, 'rb') as f:
+            return list(ijson.items(f, 'data.item', use_float=True))
+    
+    data = _json_loads(DATA_FILE.read_bytes())
+    # Extract publications from the data structure
+    return data.get('data', [])
+
+def load_publications_cache():
+    """Return the cached publications and their indexes, re-parsing the file if it changed"""
     try:
-        project_root = get_project_root()
-        data_file = project_root / "data" / "court-accounts-publications-2025.json"
+        try:
+            st = DATA_FILE.stat()
+        except FileNotFoundError:
+            logger.warning("⚠️ Data file not found: %s", DATA_FILE)
+            return {"data": [], **_build_publication_indexes([])}
         
-        if not data_file.exists():
-            print(f"⚠️ Data file not found: {data_file}")
-            return []
-            
-        with open(data_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with _PUB_CACHE_LOCK:
+            if _PUB_CACHE["mtime"] != st.st_mtime_ns:
+                publications = _parse_publications_file(st.st_size)
+                _PUB_CACHE.update(_build_publication_indexes(publications))
+                _PUB_CACHE["data"] = publications
+                _PUB_CACHE["mtime"] = st.st_mtime_ns
+                logger.debug("✅ Loaded %d publications from JSON file", len(publications))
             
-        # Extract publications from the data structure
-        publications = data.get('data', [])
-        print(f"✅ Loaded {len(publications)} publications from JSON file")
-        return publications
+            return dict(_PUB_CACHE)
         
     except Exception as e:
-        print(f"❌ Error loading publications data: {e}")
-        return []
+        logger.error("❌ Error loading publications data: %s", e)
+        return {"data": [], **_build_publication_indexes([])}
 
-async def get_scraper_service():
-    """Get the Court of Accounts scraper service"""
-    try:
-        project_root = get_project_root()
-        app_services_path = project_root / "app" / "services"
-        
-        # Add the app services path to Python path
-        if str(app_services_path) not in sys.path:
-            sys.path.insert(0, str(app_services_path))
-        
-        print(f"🔍 Trying to import from: {app_services_path}")
-        
-        try:
-            from court_accounts_service import CourtAccountsService
-            print("✅ Successfully imported CourtAccountsService")
-            return CourtAccountsService()
-        except ImportError as import_error:
-            print(f"❌ Import error: {import_error}")
-            
-            # Try alternative import paths
-            try:
-                # Try importing from the app directory
-                app_path = project_root / "app"
-                if str(app_path) not in sys.path:
-                    sys.path.insert(0, str(app_path))
-                
-                from services.court_accounts_service import CourtAccountsService
-                print("✅ Successfully imported CourtAccountsService from app.services")
-                return CourtAccountsService()
-            except ImportError as alt_import_error:
-                print(f"❌ Alternative import also failed: {alt_import_error}")
-                
-                # Return a mock service for testing
-                print("⚠️ Using mock service for testing")
-                return MockScraperService()
-                
-    except Exception as e:
-        print(f"❌ Error in get_scraper_service: {e}")
-        print("⚠️ Using mock service as fallback")
-        return MockScraperService()
+def load_publications_data():
+    """Load publications data from JSON file (cached until the file changes)"""
+    return load_publications_cache()["data"]
 
-class MockScraperService:
-    """Mock service for testing when real service is not available"""
-    
-    def __init__(self):
-        self.is_running = False
-        print("🔧 MockScraperService initialized")
+def init_scraper_service():
+    """Create the scraper service singleton if it does not exist yet"""
+    global _SERVICE_SINGLETON
+    if _SERVICE_SINGLETON is None:
+        from app.services.court_accounts_service import CourtAccountsService
+        # Only the scraping side is used here (reads are served from _PUB_CACHE),
+        # so skip loading the data file and building the service's search indexes
+        _SERVICE_SINGLETON = CourtAccountsService(preload=False)
+    return _SERVICE_SINGLETON
+
+async def get_scraper_service():
+    """Get the Court of Accounts scraper service (created once per process)"""
+    if _SERVICE_SINGLETON is not None:
+        return _SERVICE_SINGLETON
     
-    async def start_scraping(self, request_data):
-        """Mock scraping method"""
-        print(f"🔧 Mock scraping called with: {request_data}")
-        
-        # Simulate a successful scraping response
-        class MockResponse:
-            def __init__(self):
-                self.success = True
-                self.publications_count = 5
-                self.message = "Mock scraping completed (real service not available)"
-        
-        return MockResponse()
+    async with _SERVICE_LOCK:
+        return init_scraper_service()
+
+async def close_scraper_service():
+    """Release resources held by the scraper service singleton"""
+    if _SERVICE_SINGLETON is not None:
+        await _SERVICE_SINGLETON.aclose()
 
 @router.get("/court-accounts/publications")
 async def get_publications(
@@ -109,12 +156,17 @@ async def get_publications(
 ):
     """Get publications with optional filtering"""
     try:
-        publications = load_publications_data()
+        cache = load_publications_cache()
         
-        if year:
-            publications = [p for p in publications if p.get("year") == year]
-        if category:
-            publications = [p for p in publications if p.get("category") == category]
+        if year and category:
+            publications = cache["by_year_category"].get((year, category), [])
+        elif year:
+            publications = cache["by_year"].get(year, [])
+        elif category:
+            publications = cache["by_category"].get(category, [])
+        else:
+            # Unfiltered listing: serve the body serialized at load time
+            return Response(content=cache["all_response"], media_type="application/json")
             
         return {
             "success": True,
@@ -128,15 +180,23 @@ async def get_publications(
 async def get_available_categories():
     """Get available categories"""
     try:
-        publications = load_publications_data()
-        categories = list(set(p.get("category", "") for p in publications if p.get("category")))
+        categories = list(load_publications_cache()["categories"])
         return {"categories": categories}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/court-accounts/scrape")
-async def start_scraping(request_data: Dict[str, Any] = Body(default=None)):
-    """Start live scraping of Court of Accounts publications"""
+async def start_scraping(
+    background_tasks: BackgroundTasks,
+    http_response: Response,
+    request_data: Dict[str, Any] = Body(default=None)
+):
+    """Start live scraping of Court of Accounts publications
+    
+    The scrape runs as a background job of the scraper service; the response
+    is 202 with a job_id whose progress is reported by
+    /court-accounts/status?job_id=...
+    """
     try:
         # Get the scraper service
         service = await get_scraper_service()
@@ -147,63 +207,42 @@ async def start_scraping(request_data: Dict[str, Any] = Body(default=None)):
                 "details": {"status": "error", "reason": "service_initialization_failed"}
             }
         
-        # Check if scraping is already running
-        if hasattr(service, 'is_running') and service.is_running:
-            return {
-                "success": False,
-                "message": "Scraping is already running",
-                "details": {"status": "running"}
-            }
-        
         # Start the actual scraping process
-        print("🚀 Starting live scraping...")
+        logger.debug("🚀 Starting live scraping...")
         
         # Use request data from frontend or defaults
         max_pages = request_data.get('max_pages', 10) if request_data else 10
         force_rescrape = request_data.get('force_rescrape', True) if request_data else True
         
-        print(f"📊 Scraping parameters: max_pages={max_pages}, force_rescrape={force_rescrape}")
+        logger.debug("📊 Scraping parameters: max_pages=%s, force_rescrape=%s", max_pages, force_rescrape)
         
-        # Try to create a simple scraping request
-        try:
-            # Create a simple dict instead of importing the model
-            request_data_dict = {
-                "max_pages": max_pages,
-                "force_rescrape": force_rescrape
-            }
-            
-            # Run the scraper
-            print("🔄 Running scraper...")
-            response = await service.start_scraping(request_data_dict)
-            
-            if response and hasattr(response, 'success') and response.success:
-                publications_count = getattr(response, 'publications_count', 0)
-                print(f"✅ Scraping completed! Found {publications_count} publications")
-                return {
-                    "success": True,
-                    "message": f"Scraping completed! Found {publications_count} publications.",
-                    "publications_count": publications_count,
-                    "details": {"status": "completed"}
-                }
-            else:
-                error_msg = getattr(response, 'message', 'Unknown error') if response else 'No response from service'
-                print(f"❌ Scraping failed: {error_msg}")
-                return {
-                    "success": False,
-                    "message": f"Scraping failed: {error_msg}",
-                    "details": {"status": "failed"}
-                }
-                
-        except Exception as scraping_error:
-            print(f"❌ Error during scraping execution: {scraping_error}")
+        # Create a simple dict instead of importing the model
+        request_data_dict = {
+            "max_pages": max_pages,
+            "force_rescrape": force_rescrape
+        }
+        
+        job_id = service.start_scraping_job(request_data_dict)
+        if job_id is None:
             return {
                 "success": False,
-                "message": f"Scraping execution error: {str(scraping_error)}",
-                "details": {"status": "error", "reason": "execution_failed"}
+                "message": "Scraping is already running",
+                "details": {"status": "running"}
             }
+        # Keep the request (and so the serverless invocation) alive until the job finishes
+        background_tasks.add_task(service.wait_for_job, job_id)
+        
+        http_response.status_code = 202
+        return {
+            "success": True,
+            "job_id": job_id,
+            "status": "accepted",
+            "message": "Scraping started",
+            "details": {"status": "accepted"}
+        }
             
     except Exception as e:
-        print(f"❌ Error during scraping setup: {e}")
+        logger.error("❌ Error during scraping setup: %s", e)
         return {
             "success": False,
             "message": f"Scraping setup error: {str(e)}",
@@ -211,15 +250,28 @@ async def start_scraping(request_data: Dict[str, Any] = Body(default=None)):
         }
 
 @router.get("/court-accounts/status")
-async def get_scraping_status():
-    """Get current scraping status"""
+async def get_scraping_status(
+    job_id: Optional[str] = Query(None, description="Scrape job ID returned by /court-accounts/scrape")
+):
+    """Get current scraping status, or the status of a single scrape job"""
+    if job_id is not None:
+        service = await get_scraper_service()
+        job = service.get_job(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job_id: {job_id}")
+        return {
+            "success": True,
+            "message": "Job status retrieved successfully",
+            "details": job
+        }
+    
     try:
         publications = load_publications_data()
         return {
             "success": True,
             "message": "Status retrieved successfully",
             "details": {
-                "is_running": False,
+                "is_running": _SERVICE_SINGLETON is not None and _SERVICE_SINGLETON.is_running,
                 "last_run": None,
                 "publications_count": len(publications)
             }
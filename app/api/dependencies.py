@@ -3,16 +3,22 @@
 Shared API dependencies
 """
 
-from fastapi import Depends, HTTPException, status
+import threading
+import time
+from collections import OrderedDict, deque
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from ..core.config import settings
+from ..core.security import is_valid_api_key
+from ..services.court_accounts_service import CourtAccountsService
 
 # HTTP Bearer scheme
 security = HTTPBearer()
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Get current user from API key"""
-    if credentials.credentials != settings.api_key:
+    if not is_valid_api_key(credentials.credentials):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key",
@@ -20,34 +26,57 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         )
     return {"api_key": credentials.credentials}
 
-# Rate limiting dependency (simple implementation)
+def get_svc(request: Request) -> CourtAccountsService:
+    """The app's CourtAccountsService, created by the lifespan handler"""
+    return request.app.state.svc
+
+# Rate limiting dependency (sliding window of the last minute's requests)
 class RateLimiter:
-    def __init__(self, max_requests: int = 60):
+    def __init__(self, max_requests: int = 60, window_seconds: float = 60, soft_cap: int = 1024):
         self.max_requests = max_requests
-        self.requests = {}
+        self.window_seconds = window_seconds
+        # Number of tracked clients above which idle ones get evicted
+        self.soft_cap = soft_cap
+        # client_id -> timestamps of admitted requests, oldest first; at most
+        # max_requests are ever kept, so each check is O(1) amortized.
+        # Ordered by last access so idle clients sit at the front.
+        self.requests = OrderedDict()
+        self._lock = threading.Lock()
     
     async def check_rate_limit(self, client_id: str = "default"):
         """Check if client has exceeded rate limit"""
-        import time
-        current_time = time.time()
-        
-        if client_id not in self.requests:
-            self.requests[client_id] = []
+        current_time = time.monotonic()
+        cutoff = current_time - self.window_seconds
         
-        # Remove old requests (older than 1 minute)
-        self.requests[client_id] = [
-            req_time for req_time in self.requests[client_id] 
-            if current_time - req_time < 60
-        ]
-        
-        if len(self.requests[client_id]) >= self.max_requests:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded. Try again later."
-            )
-        
-        self.requests[client_id].append(current_time)
+        with self._lock:
+            timestamps = self.requests.get(client_id)
+            if timestamps is None:
+                timestamps = self.requests[client_id] = deque(maxlen=self.max_requests)
+            
+            # Drop requests that fell out of the window
+            while timestamps and timestamps[0] <= cutoff:
+                timestamps.popleft()
+            
+            if len(timestamps) >= self.max_requests:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Rate limit exceeded. Try again later."
+                )
+            
+            timestamps.append(current_time)
+            self.requests.move_to_end(client_id)
+            
+            if len(self.requests) > self.soft_cap:
+                self._evict_idle(cutoff)
         return True
+    
+    def _evict_idle(self, cutoff: float):
+        """Forget least-recently-seen clients with no request inside the window"""
+        while self.requests:
+            timestamps = next(iter(self.requests.values()))
+            if timestamps and timestamps[-1] > cutoff:
+                break
+            self.requests.popitem(last=False)
 
 # Create rate limiter instance
 rate_limiter = RateLimiter(settings.rate_limit_per_minute)
@@ -4,30 +4,72 @@ Court of Accounts API endpoints
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Query, HTTPException, Depends
+import orjson
+from fastapi import APIRouter, Query, HTTPException, Depends, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from app.models.court_accounts import (
     ScrapingRequest, ScrapingResponse, PublicationsResponse, 
     SearchRequest, StatusResponse
 )
-from app.services.court_accounts_service import court_accounts_service
+from app.services.court_accounts_service import CourtAccountsService
 from app.core.security import get_api_key
+from app.api.dependencies import get_svc
 
 router = APIRouter()
 
+# Lists at least this long are streamed instead of encoded into one body
+STREAM_MIN_PUBLICATIONS = 1000
+# Publications encoded per streamed chunk
+STREAM_CHUNK_SIZE = 200
+
+def _publications_response(publications) -> Response:
+    """PublicationsResponse of pre-dumped publications, serialized straight to orjson (streamed when large)"""
+    if len(publications) >= STREAM_MIN_PUBLICATIONS:
+        return StreamingResponse(_stream_publications(publications), media_type="application/json")
+    return ORJSONResponse({
+        "success": True,
+        "publications": publications,
+        "count": len(publications)
+    })
+
+def _stream_publications(publications):
+    """Yield a PublicationsResponse body chunk by chunk, so only one chunk is encoded at a time"""
+    yield b'{"success":true,"publications":['
+    for start in range(0, len(publications), STREAM_CHUNK_SIZE):
+        chunk = b",".join(orjson.dumps(pub) for pub in publications[start:start + STREAM_CHUNK_SIZE])
+        yield chunk if start == 0 else b"," + chunk
+    yield b'],"count":%d}' % len(publications)
+
 @router.post("/scrape", response_model=ScrapingResponse)
-async def start_scraping(request: ScrapingRequest):
-    """Start scraping publications from the Court of Accounts website"""
+async def start_scraping(
+    request: ScrapingRequest,
+    http_response: Response,
+    svc: CourtAccountsService = Depends(get_svc)
+):
+    """Start scraping publications from the Court of Accounts website in the background"""
     try:
-        result = await court_accounts_service.start_scraping(request)
-        return result
+        job_id = svc.start_scraping_job(request)
+        if job_id is None:
+            return ScrapingResponse(
+                success=False,
+                message="Scraping is already running"
+            )
+        
+        # Accepted: poll /status?job_id=... for the outcome
+        http_response.status_code = 202
+        return ScrapingResponse(
+            success=True,
+            message="Scraping started",
+            job_id=job_id
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/stop", response_model=StatusResponse)
-async def stop_scraping():
+async def stop_scraping(svc: CourtAccountsService = Depends(get_svc)):
     """Stop ongoing scraping process"""
     try:
-        result = await court_accounts_service.stop_scraping()
+        result = await svc.stop_scraping()
         return StatusResponse(
             success=True,
             message="Scraping stopped successfully",
@@ -37,10 +79,15 @@ async def stop_scraping():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/status", response_model=StatusResponse)
-async def get_scraping_status():
+async def get_scraping_status(
+    job_id: Optional[str] = Query(None, description="Background scraping job ID"),
+    svc: CourtAccountsService = Depends(get_svc)
+):
     """Get current scraping status"""
+    if job_id is not None and svc.get_job(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
     try:
-        status = await court_accounts_service.get_status()
+        status = await svc.get_status(job_id)
         return StatusResponse(
             success=True,
             message="Status retrieved successfully",
@@ -52,71 +99,58 @@ async def get_scraping_status():
 @router.get("/publications", response_model=PublicationsResponse)
 async def get_publications(
     year: Optional[int] = Query(None, description="Filter by year"),
-    category: Optional[str] = Query(None, description="Filter by category")
+    category: Optional[str] = Query(None, description="Filter by category"),
+    svc: CourtAccountsService = Depends(get_svc)
 ):
     """Get scraped publications with optional filtering"""
     try:
-        publications = await court_accounts_service.get_publications(
-            year=year, category=category
-        )
-        return PublicationsResponse(
-            success=True,
-            publications=publications,
-            count=len(publications)
+        publications = await svc.get_publications(
+            year=year, category=category, as_json=True
         )
+        return _publications_response(publications)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/publications/{year}", response_model=PublicationsResponse)
 async def get_publications_by_year(
     year: int,
-    category: Optional[str] = Query(None, description="Filter by category")
+    category: Optional[str] = Query(None, description="Filter by category"),
+    svc: CourtAccountsService = Depends(get_svc)
 ):
     """Get publications for a specific year"""
     try:
-        publications = await court_accounts_service.get_publications(year, category)
-        return PublicationsResponse(
-            success=True,
-            publications=publications,
-            count=len(publications)
-        )
+        publications = await svc.get_publications(year, category, as_json=True)
+        return _publications_response(publications)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/publications/category/{category}", response_model=PublicationsResponse)
 async def get_publications_by_category(
     category: str,
-    year: Optional[int] = Query(None, description="Filter by year")
+    year: Optional[int] = Query(None, description="Filter by year"),
+    svc: CourtAccountsService = Depends(get_svc)
 ):
     """Get publications filtered by category"""
     try:
-        publications = await court_accounts_service.get_publications(category=category)
-        return PublicationsResponse(
-            success=True,
-            publications=publications,
-            count=len(publications)
-        )
+        publications = await svc.get_publications(category=category, as_json=True)
+        return _publications_response(publications)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/search", response_model=PublicationsResponse)
-async def search_publications(request: SearchRequest):
+async def search_publications(request: SearchRequest, svc: CourtAccountsService = Depends(get_svc)):
     """Search publications by query"""
     try:
-        publications = await court_accounts_service.search_publications(request.query)
-        return PublicationsResponse(
-            success=True,
-            publications=publications,
-            count=len(publications)
-        )
+        publications = await svc.search_publications(request.query, as_json=True)
+        return _publications_response(publications)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/categories")
-async def get_available_categories():
+async def get_available_categories(svc: CourtAccountsService = Depends(get_svc)):
     """Get list of available publication categories"""
     try:
-        categories = await court_accounts_service.get_available_categories()
+        categories = await svc.get_available_categories()
         return {"categories": categories}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
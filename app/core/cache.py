@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Optional Redis (Upstash) cache for cache-aside lookups in the service layer
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from .config import settings
+
+try:
+    from upstash_redis.asyncio import Redis
+except ImportError:
+    Redis = None
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    def _json_dumps(value: Any) -> str:
+        return orjson.dumps(value).decode('utf-8')
+except ImportError:
+    _json_loads = json.loads
+    def _json_dumps(value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False)
+
+# Keys fetched per SCAN round trip when deleting by pattern
+_SCAN_COUNT = 500
+
+logger = logging.getLogger(__name__)
+
+_client = None
+# One lock per cache key being computed, so concurrent misses compute the value only once;
+# each entry is [lock, users] and is dropped once nobody holds or waits for it
+_locks: Dict[str, List[Any]] = {}
+
+def _get_client():
+    """Create the Redis client on first use; None when caching is not configured"""
+    global _client
+    if _client is None and Redis is not None and settings.upstash_redis_rest_url and settings.upstash_redis_rest_token:
+        _client = Redis(url=settings.upstash_redis_rest_url, token=settings.upstash_redis_rest_token)
+    return _client
+
+def enabled() -> bool:
+    """Whether a Redis cache is configured"""
+    return _get_client() is not None
+
+@asynccontextmanager
+async def lock(key: str) -> AsyncIterator[None]:
+    """Hold the lock guarding the computation of a single cache key"""
+    entry = _locks.get(key)
+    if entry is None:
+        entry = _locks[key] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _locks[key]
+
+async def get(key: str) -> Optional[Any]:
+    """Get a cached JSON value, or None on a miss or cache error"""
+    client = _get_client()
+    if client is None:
+        return None
+    try:
+        raw = await client.get(key)
+        return _json_loads(raw) if raw is not None else None
+    except Exception as e:
+        logger.warning("Cache get failed for %s: %s", key, e)
+        return None
+
+async def set_value(key: str, value: Any, ex: Optional[int] = None) -> None:
+    """Store a JSON-serializable value, expiring after ex seconds"""
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        await client.set(key, _json_dumps(value), ex=ex or settings.cache_ttl_seconds)
+    except Exception as e:
+        logger.warning("Cache set failed for %s: %s", key, e)
+
+async def delete_pattern(pattern: str) -> None:
+    """Delete every key matching a glob-style pattern"""
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        # SCAN walks the keyspace incrementally instead of blocking Redis like KEYS
+        cursor = 0
+        while True:
+            cursor, keys = await client.scan(cursor, match=pattern, count=_SCAN_COUNT)
+            if keys:
+                await client.delete(*keys)
+            if cursor == 0:
+                break
+    except Exception as e:
+        logger.warning("Cache delete failed for %s: %s", pattern, e)
@@ -21,6 +21,7 @@ class Settings(BaseSettings):
     # Environment
     vercel_env: str = os.getenv("VERCEL_ENV", "development")
     debug: bool = os.getenv("VERCEL_ENV", "development") == "development"
+    log_level: str = os.getenv("LOG_LEVEL", "WARNING")
     
     # Database (if using external)
     database_url: Optional[str] = os.getenv("DATABASE_URL")
@@ -28,9 +29,11 @@ class Settings(BaseSettings):
     # Redis (if using Vercel KV)
     upstash_redis_rest_url: Optional[str] = os.getenv("UPSTASH_REDIS_REST_URL")
     upstash_redis_rest_token: Optional[str] = os.getenv("UPSTASH_REDIS_REST_TOKEN")
+    cache_ttl_seconds: int = 300  # TTL of cached publication queries
     
     # Scraper Configuration
     scraper_config_file: str = os.getenv("SCRAPER_CONFIG_FILE", "config/scraper_config.json")
+    max_concurrent_scrapes: int = int(os.getenv("MAX_CONCURRENT_SCRAPES", "1"))
     
     # Rate Limiting
     rate_limit_per_minute: int = 60
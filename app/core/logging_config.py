@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Logging setup for the FastAPI application
+"""
+
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+def start_queue_logging(level: str = "WARNING") -> QueueListener:
+    """Route the app.* loggers through a queue so request handlers never block on log IO.
+    
+    Records are formatted and written by a QueueListener thread; stop the returned
+    listener on shutdown to flush it.
+    """
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(level.upper())
+    # Replace the queue of a previous start (e.g. the app's lifespan running again)
+    for old_handler in [h for h in app_logger.handlers if isinstance(h, QueueHandler)]:
+        app_logger.removeHandler(old_handler)
+    app_logger.addHandler(QueueHandler(log_queue))
+    app_logger.propagate = False
+    
+    listener.start()
+    return listener
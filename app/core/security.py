@@ -3,6 +3,8 @@
 Security utilities for API authentication
 """
 
+import hmac
+
 from fastapi import HTTPException, Security, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from .config import settings
@@ -10,9 +12,16 @@ from .config import settings
 # HTTP Bearer scheme for API key authentication
 security = HTTPBearer()
 
+# Encoded once; bytes also let non-ASCII keys be compared in constant time
+API_KEY_BYTES = settings.api_key.encode('utf-8')
+
+def is_valid_api_key(api_key: str) -> bool:
+    """Constant-time check of an API key against the configured one"""
+    return hmac.compare_digest(api_key.encode('utf-8'), API_KEY_BYTES)
+
 async def verify_api_key(credentials: HTTPAuthorizationCredentials = Security(security)):
     """Verify the API key from the Authorization header"""
-    if credentials.credentials != settings.api_key:
+    if not is_valid_api_key(credentials.credentials):
         raise HTTPException(
             status_code=401,
             detail="Invalid API key",
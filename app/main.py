@@ -6,19 +6,41 @@ Main entry point for Vercel deployment
 
 import os
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # Add the src directory to the Python path
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Response
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse
 
 from .api.v1.api import api_router
 from .core.config import settings
+from .core.logging_config import start_queue_logging
+from .services.court_accounts_service import CourtAccountsService
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create and warm this worker's service; release its pooled HTTP session on shutdown"""
+    log_listener = start_queue_logging(settings.log_level)
+    try:
+        app.state.svc = CourtAccountsService(preload=False)
+        await app.state.svc.async_warm()
+        yield
+    finally:
+        try:
+            if getattr(app.state, "svc", None) is not None:
+                await app.state.svc.aclose()
+        finally:
+            # Always stop the listener so records still queued are flushed to the handlers
+            log_listener.stop()
 
 # Create FastAPI app
 app = FastAPI(
@@ -26,9 +48,14 @@ app = FastAPI(
     description="API for scraping and retrieving Court of Accounts publications",
     version="1.0.0",
     docs_url="/docs/",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+# Compress JSON/HTML responses (added before CORS so CORS stays outermost)
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -41,8 +68,24 @@ app.add_middleware(
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
-# Mount static files from public directory
-app.mount("/", StaticFiles(directory="public", html=True), name="static")
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles with Cache-Control and an mtime-based ETag, so repeat requests revalidate to 304"""
+    
+    cache_control = "public, max-age=86400"
+    
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = FileResponse(
+            full_path, status_code=status_code, stat_result=stat_result, method=scope["method"]
+        )
+        # Pages are always revalidated so a deploy shows up at once; assets are cached for a day
+        if str(full_path).endswith(".html"):
+            response.headers["Cache-Control"] = "no-cache"
+        else:
+            response.headers["Cache-Control"] = self.cache_control
+        response.headers["ETag"] = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
 
 # Health check endpoint
 @app.get("/health")
@@ -50,10 +93,23 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "service": "Court of Accounts Scraper API"}
 
+# Favicon bytes read once at import; None when the file is absent
+_FAVICON_FILE = Path(__file__).parent.parent / "public" / "favicon.ico"
+_FAVICON = _FAVICON_FILE.read_bytes() if _FAVICON_FILE.is_file() else None
+
 @app.get("/favicon.ico")
 async def favicon():
     """Serve favicon"""
-    return FileResponse("public/favicon.ico")
+    if _FAVICON is None:
+        return Response(status_code=404)
+    return Response(
+        content=_FAVICON,
+        media_type="image/x-icon",
+        headers={"Cache-Control": "public, max-age=604800"}
+    )
+
+# Mount static files from public directory last, so the routes above aren't shadowed
+app.mount("/", CachedStaticFiles(directory="public", html=True), name="static")
 
 # For local development
 if __name__ == "__main__":
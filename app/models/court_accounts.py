@@ -38,6 +38,7 @@ class ScrapingResponse(BaseModel):
     publications_count: Optional[int] = Field(None, description="Number of publications scraped")
     file_path: Optional[str] = Field(None, description="Path to saved data file")
     execution_time: Optional[float] = Field(None, description="Execution time in seconds")
+    job_id: Optional[str] = Field(None, description="Background scraping job ID")
 
 class PublicationsResponse(BaseModel):
     """Response model for publications data"""
@@ -5,11 +5,18 @@ Service layer for Court of Accounts scraping operations
 
 import time
 import sys
+import asyncio
+import uuid
 import os
 import json
+import re
+import hashlib
+import logging
+from collections import defaultdict
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
+from pydantic import TypeAdapter, ValidationError
 
 # Add the src directory to the Python path
 src_path = Path(__file__).parent.parent.parent / "src"
@@ -17,44 +24,233 @@ sys.path.insert(0, str(src_path))
 
 from moroccan_parliament_scraper.core.court_accounts_scraper import CourtOfAccountsScraper
 from app.models.court_accounts import ScrapingRequest, ScrapingResponse, Publication
+from app.core import cache
+from app.core.config import settings
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+DATA_FILE = Path(__file__).parent.parent.parent / "data" / "court-accounts-publications-2025.json"
+
+logger = logging.getLogger(__name__)
+
+# Validates a whole list of publications in one call into pydantic-core
+_PUBLICATIONS_ADAPTER = TypeAdapter(List[Publication])
+# Missing required text fields default to empty strings, the rest to None
+_PUBLICATION_DEFAULTS = {'title': '', 'category': '', 'url': ''}
+
+# Word tokenizer shared by the search index and search queries
+_TOKEN_RE = re.compile(r"\w+")
+
+# Substring searches run on google-re2's DFA engine when it is installed
+try:
+    import re2 as _search_re
+except ImportError:
+    _search_re = re
+
+# Finished scrape jobs kept around for status lookups
+_MAX_FINISHED_JOBS = 20
 
 class CourtAccountsService:
     """Service for Court of Accounts scraping operations"""
     
-    def __init__(self):
+    def __init__(self, preload: bool = True):
         self.scraper = None
         self.is_running = False
         self.last_run = None
         self.last_run_duration = None
-        self.last_scraped_data = []  # Store last scraped data in memory
-        self._load_existing_data()  # Load existing data from JSON file
+        self.http_session = None  # Pooled httpx.AsyncClient shared by every scraper run
+        # Bounds concurrent scrapes (and their outbound load); one slot is held per running scrape
+        self._scrape_slots = asyncio.BoundedSemaphore(settings.max_concurrent_scrapes)
+        self._active_scrapes = 0
+        self._jobs = {}  # job_id -> asyncio.Task of a background scrape
+        # Publications in memory plus their indexes (see _build_indexes). Replaced
+        # as a whole, never mutated, so readers work on a consistent snapshot
+        self._index = self._build_indexes([])
+        self._swap_lock = asyncio.Lock()  # Serializes index rebuilds
+        self._data_file_key = None  # (mtime_ns, size) of the last parsed data file
+        self._file_categories = []  # publication_categories metadata of the data file
+        if preload:
+            self._load_existing_data()  # Load existing data from JSON file
+    
+    @property
+    def last_scraped_data(self) -> List[Dict[str, Any]]:
+        """Publications currently served (last scraped or loaded from file)"""
+        return self._index["data"]
+    
+    async def async_warm(self):
+        """Load existing data without blocking the event loop (for services built with preload=False)"""
+        await self._refresh_data_from_file()
+    
+    @staticmethod
+    def _parse_file(path: Path) -> Dict[str, Any]:
+        """Read and parse a publications JSON file (blocking)"""
+        return _json_loads(path.read_bytes())
+    
+    def _changed_file_key(self) -> Optional[tuple]:
+        """(mtime_ns, size) of the data file if it changed since the last load, else None"""
+        if not DATA_FILE.exists():
+            return None
+        st = DATA_FILE.stat()
+        file_key = (st.st_mtime_ns, st.st_size)
+        return None if file_key == self._data_file_key else file_key
+    
+    def _apply_file_data(self, data: Dict[str, Any], file_key: tuple) -> List[Dict[str, Any]]:
+        """Record a parsed data file's metadata and return the publications to serve from it"""
+        self._data_file_key = file_key
+        categories = data.get('publication_categories')
+        self._file_categories = categories if isinstance(categories, list) else []
+        if 'data' in data and isinstance(data['data'], list):
+            logger.info("Loaded %d publications from existing data file", len(data['data']))
+            return data['data']
+        return self.last_scraped_data
+    
+    def _load_failed(self, error: Exception):
+        """Reset to no publications after a failed load"""
+        logger.error("Error loading existing data: %s", error)
+        self._data_file_key = None
+        self._index = self._build_indexes([])
     
     def _load_existing_data(self):
-        """Load existing publications data from JSON file"""
+        """Load existing publications data from JSON file; blocking, so only used by __init__"""
         try:
-            data_file = Path(__file__).parent.parent.parent / "data" / "court-accounts-publications-2025.json"
-            if data_file.exists():
-                with open(data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if 'data' in data and isinstance(data['data'], list):
-                        self.last_scraped_data = data['data']
-                        print(f"Loaded {len(self.last_scraped_data)} publications from existing data file")
+            file_key = self._changed_file_key()
+            if file_key is not None:
+                self._index = self._build_indexes(self._apply_file_data(self._parse_file(DATA_FILE), file_key))
         except Exception as e:
-            print(f"Error loading existing data: {e}")
-            self.last_scraped_data = []
+            self._load_failed(e)
+    
+    async def _swap_index(self, publications: List[Dict[str, Any]]):
+        """Build the indexes for publications in a worker thread, then publish them in one assignment"""
+        async with self._swap_lock:
+            self._index = await asyncio.to_thread(self._build_indexes, publications)
+    
+    @classmethod
+    def _build_indexes(cls, publications: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Index publications by year and category so filters are dict lookups"""
+        by_year = defaultdict(list)
+        by_category = defaultdict(list)
+        by_year_category = defaultdict(list)
+        inverted = defaultdict(set)
+        searchable = []
+        for i, pub in enumerate(publications):
+            by_year[pub.get('year')].append(i)
+            by_category[pub.get('category')].append(i)
+            by_year_category[(pub.get('year'), pub.get('category'))].append(i)
+            text = cls._searchable_text(pub)
+            searchable.append(text)
+            for token in _TOKEN_RE.findall(text):
+                inverted[token].add(i)
+        models = cls._to_publications(publications)
+        return {
+            "data": publications,
+            # Row positions in data, by year, category and (year, category)
+            "by_year": dict(by_year),
+            "by_category": dict(by_category),
+            "by_year_category": dict(by_year_category),
+            "categories": sorted(category for category in by_category if category),
+            "inverted": dict(inverted),  # lower-cased token -> row positions containing it
+            "searchable": searchable,  # Lower-cased searchable text per row
+            "models": models,  # Validated Publication per row (None if invalid)
+            # Dumped once here so JSON responses don't re-serialize the models per request
+            "json": [model.model_dump(mode='json') if model is not None else None for model in models]
+        }
     
-    def _refresh_data_from_file(self):
-        """Refresh publications data from JSON file"""
-        self._load_existing_data()
+    @staticmethod
+    def _to_publications(pubs: List[Dict[str, Any]]) -> List[Optional[Publication]]:
+        """Validate all publication rows in one batch; invalid rows become None"""
+        rows = [{name: pub.get(name, _PUBLICATION_DEFAULTS.get(name)) for name in Publication.model_fields}
+                for pub in pubs]
+        try:
+            return _PUBLICATIONS_ADAPTER.validate_python(rows)
+        except ValidationError as e:
+            # Skip invalid publications and validate the rest again in one batch
+            invalid = {error['loc'][0] for error in e.errors()}
+            logger.warning("Skipping %d invalid publications: %s", len(invalid), e)
+            valid = iter(_PUBLICATIONS_ADAPTER.validate_python(
+                [row for i, row in enumerate(rows) if i not in invalid]
+            ))
+            return [None if i in invalid else next(valid) for i in range(len(rows))]
+    
+    async def _cached(self, key: str, index: Dict[str, Any], compute_ids, as_json: bool):
+        """Publications of index at the row positions from compute_ids, cache-aside in Redis when configured"""
+        if not cache.enabled():
+            ids = compute_ids()
+            return self._json_for(index, ids) if as_json else self._models_for(index, ids)
+        
+        cached = await cache.get(key)
+        if cached is None:
+            # Only one coroutine per key recomputes on a miss
+            async with cache.lock(key):
+                cached = await cache.get(key)
+                if cached is None:
+                    ids = compute_ids()
+                    cached = self._json_for(index, ids)
+                    await cache.set_value(key, cached)
+                    return cached if as_json else self._models_for(index, ids)
+        return cached if as_json else [Publication.model_validate(pub) for pub in cached]
+    
+    @staticmethod
+    def _models_for(index: Dict[str, Any], ids) -> List[Publication]:
+        """Cached Publication models for the given row positions"""
+        models = index["models"]
+        return [models[i] for i in ids if models[i] is not None]
+    
+    @staticmethod
+    def _json_for(index: Dict[str, Any], ids) -> List[Dict[str, Any]]:
+        """Cached JSON-ready publications for the given row positions"""
+        rows = index["json"]
+        return [rows[i] for i in ids if rows[i] is not None]
+    
+    @staticmethod
+    def _searchable_text(pub: Dict[str, Any]) -> str:
+        """Lower-cased text that search queries are matched against"""
+        # The unit separator keeps substring matches from spanning two fields
+        return '\x1f'.join((
+            pub.get('title') or '',
+            pub.get('category') or '',
+            pub.get('description') or ''
+        )).lower()
+    
+    @staticmethod
+    def _filter_ids(index: Dict[str, Any], year: Optional[int] = None, category: Optional[str] = None):
+        """Row positions matching the optional year/category filters, in data order"""
+        if year and category:
+            return index["by_year_category"].get((year, category), [])
+        if year:
+            return index["by_year"].get(year, [])
+        if category:
+            return index["by_category"].get(category, [])
+        return range(len(index["data"]))
+    
+    async def _refresh_data_from_file(self):
+        """Refresh publications data from JSON file, reading it in a worker thread"""
+        try:
+            file_key = self._changed_file_key()
+            if file_key is not None:
+                data = await asyncio.to_thread(self._parse_file, DATA_FILE)
+                await self._swap_index(self._apply_file_data(data, file_key))
+        except Exception as e:
+            self._load_failed(e)
 
     async def start_scraping(self, request) -> ScrapingResponse:
         """Start scraping with the given parameters"""
-        if self.is_running:
+        if self._scrape_slots.locked():
             return ScrapingResponse(
                 success=False,
                 message="Scraping is already running"
             )
         
+        async with self._scrape_slots:
+            return await self._scrape(request)
+    
+    async def _scrape(self, request) -> ScrapingResponse:
+        """Run one scrape; the caller holds a _scrape_slots slot"""
+        scraper = None
+        self._active_scrapes += 1
         try:
             self.is_running = True
             start_time = time.time()
@@ -73,24 +269,32 @@ class CourtAccountsService:
                 force_rescrape = False
                 max_pages = 10
             
-            print(f"🔧 Scraping parameters: force_rescrape={force_rescrape}, max_pages={max_pages}")
+            logger.debug("🔧 Scraping parameters: force_rescrape=%s, max_pages=%s", force_rescrape, max_pages)
             
             # Create scraper instance
             # Fix the config file path to use absolute path
             project_root = Path(__file__).parent.parent.parent
             config_file = str(project_root / "config" / "scraper_config.json")
             
-            print(f"🔧 Using config file: {config_file}")
+            logger.debug("🔧 Using config file: %s", config_file)
             
-            self.scraper = CourtOfAccountsScraper(
+            scraper = self.scraper = CourtOfAccountsScraper(
                 force_rescrape=force_rescrape,
-                config_file=config_file
+                config_file=config_file,
+                session=self.http_session
             )
+            # Keep the first run's session so later runs reuse its connections
+            self.http_session = scraper.session
             
-            # Run the scraper
-            success = self.scraper.run(
-                max_pages=max_pages
-            )
+            # Prefer the scraper's native async run; otherwise run it in a
+            # worker thread so the event loop keeps serving
+            if hasattr(scraper, 'arun'):
+                success = await scraper.arun(max_pages=max_pages)
+            else:
+                success = await asyncio.to_thread(
+                    scraper.run,
+                    max_pages=max_pages
+                )
             
             execution_time = time.time() - start_time
             self.last_run = datetime.now()
@@ -98,12 +302,13 @@ class CourtAccountsService:
             
             if success:
                 # Store results in memory
-                self.last_scraped_data = self.scraper.results
+                await self._swap_index(scraper.results)
+                await cache.delete_pattern("pubs:*")
                 
                 return ScrapingResponse(
                     success=True,
                     message="Scraping completed successfully",
-                    publications_count=len(self.last_scraped_data),
+                    publications_count=len(scraper.results),
                     file_path="Data stored in memory",
                     execution_time=execution_time
                 )
@@ -120,8 +325,56 @@ class CourtAccountsService:
                 message=f"Scraping error: {str(e)}"
             )
         finally:
-            self.is_running = False
-            self.scraper = None
+            if scraper is not None:
+                # Adopt the client the run ended with (proxy rotation may replace it)
+                self.http_session = scraper.session
+                await scraper.aclose(keep_session=True)
+            self._active_scrapes -= 1
+            self.is_running = self._active_scrapes > 0
+            if self.scraper is scraper:
+                self.scraper = None
+    
+    def start_scraping_job(self, request) -> Optional[str]:
+        """Start scraping in the background and return its job id, or None if a scrape is running"""
+        running_jobs = sum(not task.done() for task in self._jobs.values())
+        if self._scrape_slots.locked() or running_jobs >= settings.max_concurrent_scrapes:
+            return None
+        
+        self._forget_finished_jobs()
+        job_id = uuid.uuid4().hex
+        self._jobs[job_id] = asyncio.create_task(self.start_scraping(request))
+        return job_id
+    
+    def _forget_finished_jobs(self):
+        """Drop the oldest finished jobs beyond _MAX_FINISHED_JOBS"""
+        finished = [job_id for job_id, task in self._jobs.items() if task.done()]
+        for job_id in finished[:max(0, len(finished) - _MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+    
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """State of a background scrape job, or None if the id is unknown"""
+        task = self._jobs.get(job_id)
+        if task is None:
+            return None
+        
+        job = {"job_id": job_id, "status": "running"}
+        if task.cancelled():
+            job["status"] = "cancelled"
+        elif task.done():
+            if task.exception() is not None:
+                job["status"] = "failed"
+                job["error"] = str(task.exception())
+            else:
+                result = task.result()
+                job["status"] = "completed" if result.success else "failed"
+                job["result"] = result.model_dump()
+        return job
+    
+    async def wait_for_job(self, job_id: str) -> None:
+        """Wait until a background scrape job has finished (its outcome is read with get_job)"""
+        task = self._jobs.get(job_id)
+        if task is not None:
+            await asyncio.wait({task})
     
     async def stop_scraping(self) -> Dict[str, Any]:
         """Stop the currently running scraper"""
@@ -147,143 +400,102 @@ class CourtAccountsService:
                 "message": f"Error stopping scraper: {str(e)}"
             }
     
-    async def get_publications(self, year: Optional[int] = None, category: Optional[str] = None) -> List[Publication]:
-        """Get publications from memory (last scraped data) or from file if needed"""
+    async def aclose(self):
+        """Release the pooled HTTP connections"""
+        if self.http_session is not None:
+            await self.http_session.aclose()
+            self.http_session = None
+    
+    async def get_publications(self, year: Optional[int] = None, category: Optional[str] = None,
+                               as_json: bool = False) -> Union[List[Publication], List[Dict[str, Any]]]:
+        """Get publications from memory (last scraped data) or from file if needed.
+        
+        With as_json=True the publications are returned as shared, JSON-ready dicts.
+        """
         # If no data in memory, try to load from file
         if not self.last_scraped_data:
-            self._refresh_data_from_file()
+            await self._refresh_data_from_file()
         
-        if not self.last_scraped_data:
+        index = self._index
+        if not index["data"]:
             return []
         
-        publications = self.last_scraped_data.copy()
-        
-        # Filter by year if specified
-        if year:
-            publications = [pub for pub in publications if pub.get('year') == year]
-        
-        # Filter by category if specified
-        if category:
-            publications = [pub for pub in publications if pub.get('category') == category]
-        
-        # Convert to Publication models
-        result = []
-        for pub in publications:
-            try:
-                pub_model = Publication(
-                    id=pub.get('id'),
-                    title=pub.get('title', ''),
-                    category=pub.get('category', ''),
-                    url=pub.get('url', ''),
-                    date=pub.get('date'),
-                    description=pub.get('description'),
-                    year=pub.get('year'),
-                    commission=pub.get('commission'),
-                    ministry=pub.get('ministry'),
-                    status=pub.get('status'),
-                    file_size=pub.get('file_size'),
-                    scraped_at=pub.get('scraped_at')
-                )
-                result.append(pub_model)
-            except Exception as e:
-                # Skip invalid publications
-                print(f"Error processing publication: {e}")
-                continue
-        
-        return result
+        # Filter by year and/or category through the indexes
+        return await self._cached(
+            f"pubs:{year}:{category}",
+            index,
+            lambda: self._filter_ids(index, year, category),
+            as_json
+        )
     
-    async def search_publications(self, query: str, year: Optional[int] = None, category: Optional[str] = None) -> List[Publication]:
-        """Search publications by query"""
+    async def search_publications(self, query: str, year: Optional[int] = None, category: Optional[str] = None,
+                                  as_json: bool = False) -> Union[List[Publication], List[Dict[str, Any]]]:
+        """Search publications by query (as_json as for get_publications)"""
         # If no data in memory, try to load from file
         if not self.last_scraped_data:
-            self._refresh_data_from_file()
+            await self._refresh_data_from_file()
         
-        if not self.last_scraped_data:
+        index = self._index
+        if not index["data"]:
             return []
         
-        publications = self.last_scraped_data.copy()
-        
-        # Filter by query
         query_lower = query.lower()
-        publications = [pub for pub in publications if 
-                       query_lower in pub.get('title', '').lower() or
-                       query_lower in pub.get('category', '').lower() or
-                       query_lower in pub.get('description', '').lower()]
-        
-        # Filter by year if specified
-        if year:
-            publications = [pub for pub in publications if pub.get('year') == year]
-        
-        # Filter by category if specified
-        if category:
-            publications = [pub for pub in publications if pub.get('category') == category]
+        query_hash = hashlib.sha1(query_lower.encode('utf-8')).hexdigest()
+        return await self._cached(
+            f"pubs:search:{query_hash}:{year}:{category}",
+            index,
+            lambda: self._search_ids(index, query_lower, year, category),
+            as_json
+        )
+    
+    @classmethod
+    def _search_ids(cls, index: Dict[str, Any], query_lower: str, year: Optional[int], category: Optional[str]):
+        """Row positions of publications matching an already lower-cased query"""
+        # Narrow by year and/or category through the indexes, then by query
+        candidate_ids = cls._filter_ids(index, year, category)
         
-        # Convert to Publication models
-        result = []
-        for pub in publications:
-            try:
-                pub_model = Publication(
-                    id=pub.get('id'),
-                    title=pub.get('title', ''),
-                    category=pub.get('category', ''),
-                    url=pub.get('url', ''),
-                    date=pub.get('date'),
-                    description=pub.get('description'),
-                    year=pub.get('year'),
-                    commission=pub.get('commission'),
-                    ministry=pub.get('ministry'),
-                    status=pub.get('status'),
-                    file_size=pub.get('file_size'),
-                    scraped_at=pub.get('scraped_at')
-                )
-                result.append(pub_model)
-            except Exception as e:
-                # Skip invalid publications
-                print(f"Error processing publication: {e}")
-                continue
+        # A query word with non-word characters on both sides inside the query must appear
+        # as a whole token in any matching row, so the inverted index can pre-filter rows.
+        # Words at the query's edges may be partial (e.g. "rapport" in "Rapports") and can't
+        # be used to pre-filter
+        interior_tokens = [m.group() for m in _TOKEN_RE.finditer(query_lower)
+                           if m.start() > 0 and m.end() < len(query_lower)]
+        if interior_tokens:
+            inverted = index["inverted"]
+            matched_ids = set.intersection(*(inverted.get(token, set()) for token in interior_tokens))
+            candidate_ids = [i for i in candidate_ids if i in matched_ids]
         
-        return result
+        # The substring check decides, with one compiled pattern over each candidate's searchable text
+        search = _search_re.compile(_search_re.escape(query_lower)).search
+        searchable = index["searchable"]
+        return [i for i in candidate_ids if search(searchable[i])]
     
-    async def get_status(self) -> Dict[str, Any]:
-        """Get current scraping status"""
+    async def get_status(self, job_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get current scraping status, plus the state of a background job if given"""
         if not self.last_scraped_data:
-            self._refresh_data_from_file()
+            await self._refresh_data_from_file()
         
-        return {
+        status = {
             "is_running": self.is_running,
             "last_run": self.last_run.isoformat() if self.last_run else None,
             "last_run_duration": self.last_run_duration,
             "publications_count": len(self.last_scraped_data),
             "scraper_instance": self.scraper is not None
         }
+        if job_id is not None:
+            status["job"] = self.get_job(job_id)
+        return status
     
     async def get_available_categories(self) -> List[str]:
         """Get available categories from actual publications data"""
         # If no data in memory, try to load from file
         if not self.last_scraped_data:
-            self._refresh_data_from_file()
+            await self._refresh_data_from_file()
         
-        if not self.last_scraped_data:
-            # Try to get categories from file metadata
-            try:
-                data_file = Path(__file__).parent.parent.parent / "data" / "court-accounts-publications-2025.json"
-                if data_file.exists():
-                    with open(data_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        if 'publication_categories' in data and isinstance(data['publication_categories'], list):
-                            return sorted(data['publication_categories'])
-            except Exception as e:
-                print(f"Error reading categories from file metadata: {e}")
-            return []
+        index = self._index
+        if not index["data"]:
+            # Fall back to the file metadata read by the last load
+            return sorted(self._file_categories)
         
-        # Extract unique categories from publications
-        categories = set()
-        for pub in self.last_scraped_data:
-            if pub.get('category'):
-                categories.add(pub['category'])
-        
-        # Sort categories alphabetically
-        return sorted(list(categories))
-
-# Create global service instance
-court_accounts_service = CourtAccountsService()
+        # Unique categories, sorted alphabetically when the indexes were built
+        return index["categories"]
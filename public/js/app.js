@@ -66,11 +66,17 @@ class CourtAccountsScraper {
                 force_rescrape: document.getElementById('forceRescrape').checked
             };
 
-            const response = await this.makeRequest('/court-accounts/scrape', {
+            let response = await this.makeRequest('/court-accounts/scrape', {
                 method: 'POST',
                 body: JSON.stringify(requestData)
             });
 
+            // The scrape runs in the background; poll its job until it finishes
+            if (response.success && response.job_id) {
+                this.showMessage('Scraping in progress...', 'info');
+                response = await this.waitForScrapeJob(response.job_id);
+            }
+
             if (response.success) {
                 this.showMessage(`Scraping completed! Found ${response.publications_count} publications.`, 'success');
                 this.updateScrapingStatus(response);
@@ -85,6 +91,21 @@ class CourtAccountsScraper {
         }
     }
 
+    async waitForScrapeJob(jobId, intervalMs = 2000) {
+        while (true) {
+            const status = await this.makeRequest(`/court-accounts/status?job_id=${encodeURIComponent(jobId)}`);
+            const job = status.details;
+            if (job && job.status !== 'running') {
+                // Finished jobs carry the scrape's response; failed or cancelled ones may only have an error
+                return job.result || {
+                    success: false,
+                    message: job.error || `Scraping ${job.status}`
+                };
+            }
+            await new Promise(resolve => setTimeout(resolve, intervalMs));
+        }
+    }
+
     async stopScraping() {
         try {
             const response = await this.makeRequest('/court-accounts/stop', {
@@ -3,6 +3,11 @@
 Core scraper functionality
 """
 
-from .legislation_scraper import MoroccanParliamentScraper
-
 __all__ = ['MoroccanParliamentScraper']
+
+def __getattr__(name):
+    """Import the legislation scraper (requests, BeautifulSoup) only when it is used"""
+    if name == 'MoroccanParliamentScraper':
+        from .legislation_scraper import MoroccanParliamentScraper
+        return MoroccanParliamentScraper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
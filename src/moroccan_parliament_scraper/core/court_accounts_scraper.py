@@ -4,30 +4,320 @@ Moroccan Court of Accounts Publications Scraper
 Enhanced scraper for extracting publications data from the Court of Accounts website
 """
 
-import requests
+import asyncio
+import hashlib
+import importlib.util
+import io
+import httpx
 import json
 import re
-import time
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse, parse_qs
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit, parse_qs
 from ..utils.config_manager import ConfigManager
 from pathlib import Path
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    def _json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    def _json_line(obj):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    _json_loads = json.loads
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    def _json_line(obj):
+        return (json.dumps(obj, ensure_ascii=False) + '\n').encode('utf-8')
+
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+# lxml's C parser is much faster than the pure-Python html.parser. BeautifulSoup and lxml
+# are only imported once a page is parsed, so importing the scraper stays cheap
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') is not None else 'html.parser'
+
+# Patterns used while parsing pages, compiled once at import time
+_YEAR_RE = re.compile(r'(\d{4})')
+_AUTHOR_RE = re.compile(r'Auteur', re.IGNORECASE)
+_PDF_RE = re.compile(r'\.pdf$', re.IGNORECASE)
+_OTHER_FILE_RE = re.compile(r'\.(doc|docx|xls|xlsx|zip|rar)$', re.IGNORECASE)
+_OPEN_DOC_RE = re.compile(r'open_doc\([\'"]([^\'"]*\.pdf)[\'"]', re.IGNORECASE)
+# Detail-page date patterns in priority order: a written date ("12 janvier 2025") wins over ISO and numeric ones
+_DATE_RES = [
+    re.compile(r'(\d{1,2}\s+\w+\s+\d{4})'),
+    re.compile(r'(\d{4}-\d{2}-\d{2})'),
+    re.compile(r'(\d{2}/\d{2}/\d{4})')
+]
+_BODY_RE = re.compile(r'<body\b', re.IGNORECASE)
+# Keywords used to classify PDFs found in open_doc() links (matched against lowercased text)
+_ARABIC_KEYWORDS = ('ar', 'arabe', 'arabic', 'عربي')
+_FRENCH_KEYWORDS = ('fr', 'français')
+_SYNTHESIS_TITLE_KEYWORDS = ('synthèse', 'synthese', 'synthesis', 'resume', 'summary')
+_SYNTHESIS_URL_KEYWORDS = ('synthese', 'synthèse')
+_LISTING_DATE_RE = re.compile(r'(\d{1,2})\s+(\w+)\.\s+(\d{4})')
+_TITLE_RE = re.compile(r'-\s*(.+)$')
+
+DEFAULT_USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+
+def _element_text(element):
+    """Text of an lxml element, stripped per piece like BeautifulSoup's get_text(strip=True)"""
+    return ''.join(text.strip() for text in element.itertext())
+
+def _join_url(base_split, href):
+    """urljoin against an already split base URL, skipping the parse for absolute and root-relative links"""
+    if href.startswith(('http://', 'https://')):
+        return href
+    if href.startswith('//'):
+        return f"{base_split.scheme}:{href}"
+    if href.startswith('/') and '/.' not in href:
+        return f"{base_split.scheme}://{base_split.netloc}{href}"
+    return urljoin(urlunsplit(base_split), href)
+
+def _parse_detail_html(content, url, encoding='utf-8'):
+    """Parse the details of a publication from its detail page HTML
+    
+    A module-level function so it can run in a worker process. ``content``
+    is the raw response body; the parser decodes it with the charset the
+    server declared.
+    """
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(content, HTML_PARSER, from_encoding=encoding)
+    # File links are resolved against the page URL, split once for all of them
+    base_split = urlsplit(url)
+    
+    details = {
+        'description': '',
+        'author': '',
+        'pdf_files': [],
+        'additional_files': [],
+        'full_content': '',
+        'arabic_version_url': '',
+        'language_versions': {},
+        'publication_details': {}
+    }
+    
+    # Extract description from OpenGraph meta first, then content
+    og_description = soup.find('meta', property='og:description')
+    if og_description:
+        details['description'] = og_description.get('content', '').strip()
+    
+    # If no OG description, extract from article content
+    if not details['description']:
+        content_selectors = [
+            '.entry-content',
+            '.post-content', 
+            '.article-content',
+            '.content',
+            'article .content',
+            '.single-content'
+        ]
+        
+        for selector in content_selectors:
+            content_elem = soup.select_one(selector)
+            if content_elem:
+                # Get text content, cleaning up whitespace
+                content_text = content_elem.get_text(separator=' ', strip=True)
+                # Take first 500 characters as description
+                details['description'] = content_text[:500] + ('...' if len(content_text) > 500 else '')
+                details['full_content'] = content_text
+                break
+    
+    # Extract author information
+    author_section = soup.find('h3', string=_AUTHOR_RE)
+    if author_section:
+        author_elem = author_section.find_next('p', class_='txtRougeP1')
+        if author_elem:
+            details['author'] = author_elem.get_text(strip=True)
+    
+    # Extract language versions (Arabic, Amazigh, English)
+    language_links = soup.find_all('a', class_='wpml-ls-link')
+    for link in language_links:
+        lang_span = link.find('span', class_='wpml-ls-native')
+        if lang_span:
+            lang_text = lang_span.get_text(strip=True)
+            lang_url = link.get('href', '')
+            
+            if 'العربية' in lang_text or 'arabic' in lang_text.lower():
+                details['arabic_version_url'] = lang_url
+                details['language_versions']['arabic'] = {
+                    'name': lang_text,
+                    'url': lang_url
+                }
+            elif 'ⵜⴰⵎⴰⵣⵉⵖⵜ' in lang_text or 'amazigh' in lang_text.lower():
+                details['language_versions']['amazigh'] = {
+                    'name': lang_text,
+                    'url': lang_url
+                }
+            elif 'english' in lang_text.lower() or 'anglais' in lang_text.lower():
+                details['language_versions']['english'] = {
+                    'name': lang_text,
+                    'url': lang_url
+                }
+    
+    # Classify file links in a single pass over anchors and onclick elements:
+    # regular href attributes, plus JavaScript onclick functions (Court of Accounts specific)
+    pdf_links = []
+    other_file_links = []
+    onclick_elements = []
+    for element in soup.find_all(lambda tag: tag.name == 'a' or tag.has_attr('onclick')):
+        if element.name == 'a':
+            href = element.get('href') or ''
+            if _PDF_RE.search(href):
+                pdf_links.append(element)
+            elif _OTHER_FILE_RE.search(href):
+                other_file_links.append(element)
+        if _OPEN_DOC_RE.search(element.get('onclick') or ''):
+            onclick_elements.append(element)
+    
+    # Process regular PDF links
+    for link in pdf_links:
+        pdf_url = _join_url(base_split, link.get('href', ''))
+        pdf_text = link.get_text(strip=True)
+        file_info = {
+            'url': pdf_url,
+            'filename': pdf_url.split('/')[-1],
+            'title': pdf_text or pdf_url.split('/')[-1],
+            'type': 'pdf'
+        }
+        details['pdf_files'].append(file_info)
+    
+    # Process JavaScript onclick PDF links
+    for element in onclick_elements:
+        onclick_value = element.get('onclick', '')
+        pdf_match = _OPEN_DOC_RE.search(onclick_value)
+        if pdf_match:
+            pdf_url = pdf_match.group(1)
+            
+            # Find the title from the same item container
+            item_container = element.find_parent('div', class_='item')
+            if item_container:
+                title_elem = item_container.find('h2', class_='widthTitle')
+                if title_elem:
+                    pdf_title = title_elem.get_text(strip=True)
+                else:
+                    pdf_title = pdf_url.split('/')[-1]
+            else:
+                pdf_title = pdf_url.split('/')[-1]
+            
+            # Detect language and document type
+            title_lc = pdf_title.lower()
+            url_lc = pdf_url.lower()
+            is_arabic = any(keyword in title_lc for keyword in _ARABIC_KEYWORDS)
+            # Check both title and URL for synthesis indicators
+            is_synthesis = (any(keyword in title_lc for keyword in _SYNTHESIS_TITLE_KEYWORDS) or
+                            any(keyword in url_lc for keyword in _SYNTHESIS_URL_KEYWORDS))
+            is_french = any(keyword in title_lc for keyword in _FRENCH_KEYWORDS)
+            
+            file_info = {
+                'url': pdf_url,
+                'filename': pdf_url.split('/')[-1],
+                'title': pdf_title,
+                'type': 'pdf',
+                'language': 'arabic' if is_arabic else ('french' if is_french else 'unknown'),
+                'document_type': 'synthesis' if is_synthesis else 'main_report'
+            }
+            details['pdf_files'].append(file_info)
+    
+    # Process other files
+    for link in other_file_links:
+        file_url = _join_url(base_split, link.get('href', ''))
+        file_text = link.get_text(strip=True)
+        file_ext = file_url.split('.')[-1].lower()
+        file_info = {
+            'url': file_url,
+            'filename': file_url.split('/')[-1],
+            'title': file_text or file_url.split('/')[-1],
+            'type': file_ext
+        }
+        details['additional_files'].append(file_info)
+    
+    # Set main PDF if available
+    if details['pdf_files']:
+        main_pdf = details['pdf_files'][0]
+        details['pdf_url'] = main_pdf['url']
+        details['pdf_filename'] = main_pdf['filename']
+    
+    # Extract publication date from the raw HTML (no need to serialize the DOM text). Only the
+    # body is scanned, so <head> meta tags and JSON-LD dates don't win over the visible date
+    page_text = content.decode(encoding, errors='replace')
+    body = _BODY_RE.search(page_text)
+    body_start = body.start() if body else 0
+    for pattern in _DATE_RES:
+        match = pattern.search(page_text, body_start)
+        if match:
+            details['publication_details']['extracted_date'] = match.group(1)
+            break
+    
+    return details
+
+class RateLimiter:
+    """Token bucket shared by concurrent fetches to cap host-wide requests per second"""
+    
+    def __init__(self, requests_per_second):
+        self.requests_per_second = requests_per_second
+        # Hold at least one token, or rates below 1 request/second could never send anything
+        self.capacity = max(1, requests_per_second)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a request may be sent (no-op when the rate is not positive)"""
+        if self.requests_per_second <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                # Refill for the elapsed time, allowing bursts of up to one second's worth (at least one request)
+                self.tokens = min(self.capacity,
+                                  self.tokens + (now - self.updated_at) * self.requests_per_second)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.requests_per_second)
+
 class CourtOfAccountsScraper:
     """Enhanced scraper for Court of Accounts publications with configuration management and proxy support"""
     
-    def __init__(self, force_rescrape=None, config_file="config/scraper_config.json"):
-        """Initialize scraper with configuration"""
+    def __init__(self, force_rescrape=None, config_file="config/scraper_config.json", session=None):
+        """Initialize scraper with configuration
+        
+        An existing ``session`` (an ``httpx.AsyncClient``, e.g. one kept by a
+        long-lived service) can be passed in to reuse its pooled keep-alive
+        connections across runs. Otherwise one is created; release it with
+        ``aclose()`` (``run()`` does so itself).
+        """
         self.config = ConfigManager(config_file)
         
         # Use config settings or override with parameters
         self.force_rescrape = force_rescrape if force_rescrape is not None else self.config.get('scraper_settings.force_rescrape', False)
         self.enable_logs = self.config.get('scraper_settings.enable_logs', True)
         
+        # Log types turned off in logging_settings, resolved once instead of on every _log() call
+        shown_log_types = {
+            "detailed_extraction": self.config.get('logging_settings.show_detailed_extraction', True),
+            "progress": self.config.get('logging_settings.show_progress', True),
+            "proxy": self.config.get('logging_settings.show_proxy_info', True)
+        }
+        self._hidden_logs = frozenset(log_type for log_type, shown in shown_log_types.items() if not shown)
+        
+        # Proxy rotation
+        self.current_proxy_index = 0
+        
         # Initialize session with proxy support
-        self.session = self._create_session()
+        self.session = session if session is not None else self._create_session()
+        self._retired_sessions = []  # Clients replaced by proxy rotation, closed by aclose()
+        
+        # Host-wide request rate, so concurrent detail fetches don't get the scraper blocked
+        self._limiter = RateLimiter(self.config.get('request_settings.requests_per_second', 5))
         
         # Base URLs for Court of Accounts
         self.base_url = "https://www.courdescomptes.ma"
@@ -47,80 +337,107 @@ class CourtOfAccountsScraper:
         
         # Focus on current year only
         self.current_year = datetime.now().year
+        # Shared scraped_at timestamp for every item of a scrape, set when it starts
+        self._scrape_ts = datetime.now().isoformat()
         
         # Results storage
         self.results = []
+        # Publications already queued during the current scrape (URL, or title and date)
+        self._seen = set()
         
-        # Proxy rotation
-        self.current_proxy_index = 0
+        # Detail-page memo: URL key -> parsed details, plus fetches still in flight
+        self._detail_cache = {}
+        self._detail_tasks = {}
+        # Optional on-disk copy of the memo; only read back when not force re-scraping
+        self.detail_cache_file = self.config.get('scraper_settings.detail_cache_file', None)
+        if self.detail_cache_file and not self.force_rescrape:
+            self._load_detail_cache()
+        
+        # Optionally parse detail pages in worker processes so parsing isn't serialized by the GIL.
+        # Off by default (pages are then parsed in a worker thread): for a few dozen small pages
+        # fork and pickling cost more than they save. The pool is created on the first detail parse
+        self.parse_workers = self.config.get('scraper_settings.parse_workers', 0) or 0
+        self._parse_pool = None
         
         # Show configuration summary if logs are enabled
         if self.enable_logs:
             self.config.print_config_summary()
     
     def _create_session(self):
-        """Create requests session with proxy support"""
-        session = requests.Session()
+        """Create a pooled keep-alive httpx.AsyncClient with proxy support"""
+        # Size the pool to the detail-fetch concurrency so every worker keeps its connection
+        pool_size = max(self.config.get('request_settings.pool_maxsize', 10),
+                        self.config.get('scraper_settings.concurrency', 15))
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size, keepalive_expiry=60)
         
         # Set user agent
-        user_agent = self.config.get('request_settings.user_agent', 
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-        session.headers.update({'User-Agent': user_agent})
+        user_agent = self.config.get('request_settings.user_agent', DEFAULT_USER_AGENT)
         
         # Set proxy if enabled
+        proxies = None
         if self.config.get('proxy_settings.enable_proxies', False):
-            self._set_proxy(session)
+            proxies = self._current_proxies()
         
-        return session
+        return httpx.AsyncClient(
+            headers={'User-Agent': user_agent},
+            limits=limits,
+            timeout=self.config.get('request_settings.timeout', 30),
+            # courdescomptes.ma is a single origin: HTTP/2 multiplexes every fetch over one connection
+            http2=HTTP2_AVAILABLE and self.config.get('request_settings.http2', True),
+            proxies=proxies,
+            follow_redirects=True
+        )
     
-    def _set_proxy(self, session):
-        """Set proxy for the session"""
+    def _current_proxies(self):
+        """httpx proxy mapping for the current proxy, or None if no proxies are configured"""
         proxies_list = self.config.get('proxy_settings.proxies', [])
-        if proxies_list:
-            proxy = proxies_list[self.current_proxy_index % len(proxies_list)]
-            session.proxies.update(proxy)
-            if self.enable_logs:
-                self._log(f"🌐 Using proxy: {proxy.get('http', 'Direct connection')}", "proxy")
+        if not proxies_list:
+            return None
+        proxy = proxies_list[self.current_proxy_index % len(proxies_list)]
+        if self.enable_logs:
+            self._log(f"🌐 Using proxy: {proxy.get('http', 'Direct connection')}", "proxy")
+        return {f"{scheme}://": proxy_url for scheme, proxy_url in proxy.items() if proxy_url} or None
     
     def _rotate_proxy(self):
         """Rotate to the next proxy"""
         if self.config.get('proxy_settings.enable_proxies', False) and self.config.get('proxy_settings.proxy_rotation', True):
             self.current_proxy_index += 1
-            self._set_proxy(self.session)
+            # httpx binds proxies when a client is created, so switch to a new one;
+            # requests still in flight finish on the old client, closed by aclose()
+            self._retired_sessions.append(self.session)
+            self.session = self._create_session()
             if self.enable_logs:
                 self._log("🔄 Rotated to next proxy", "proxy")
     
+    async def aclose(self, keep_session=False):
+        """Close clients replaced by proxy rotation, unless keep_session the current client, and the parse pool"""
+        for session in self._retired_sessions:
+            await session.aclose()
+        self._retired_sessions = []
+        if not keep_session:
+            await self.session.aclose()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+            self._parse_pool = None
+    
     def _log(self, message, log_type="general"):
         """Enhanced logging with type filtering"""
-        if not self.enable_logs:
-            return
-        
-        # Check if this log type should be shown
-        show_log = True
-        if log_type == "detailed_extraction":
-            show_log = self.config.get('logging_settings.show_detailed_extraction', True)
-        elif log_type == "progress":
-            show_log = self.config.get('logging_settings.show_progress', True)
-        elif log_type == "proxy":
-            show_log = self.config.get('logging_settings.show_proxy_info', True)
-        
-        if show_log:
+        if self.enable_logs and log_type not in self._hidden_logs:
             print(message)
     
-    def _make_request(self, url, retries=None):
-        """Make HTTP request with retry logic and proxy rotation"""
+    async def _afetch(self, url, retries=None):
+        """Make an async HTTP request with retry logic and proxy rotation"""
         if retries is None:
             retries = self.config.get('request_settings.retry_attempts', 3)
         
-        timeout = self.config.get('request_settings.timeout', 30)
-        
         for attempt in range(retries + 1):
             try:
-                response = self.session.get(url, timeout=timeout)
+                await self._limiter.acquire()
+                response = await self.session.get(url)
                 response.raise_for_status()
                 return response
                 
-            except requests.exceptions.RequestException as e:
+            except (httpx.HTTPError, httpx.InvalidURL) as e:
                 if attempt < retries:
                     self._log(f"⚠️  Request failed (attempt {attempt + 1}/{retries + 1}): {e}", "progress")
                     
@@ -130,46 +447,117 @@ class CourtOfAccountsScraper:
                     
                     # Wait before retry
                     delay = self.config.get('request_settings.delay_between_requests', 2)
-                    time.sleep(delay * (attempt + 1))  # Exponential backoff
+                    await asyncio.sleep(delay * (attempt + 1))  # Exponential backoff
                 else:
                     self._log(f"❌ Request failed after {retries + 1} attempts: {e}", "progress")
                     raise
         
         return None
     
-    def extract_publications_from_page(self, page_content, base_url):
-        """Extract publication data from a publications page"""
-        soup = BeautifulSoup(page_content, 'html.parser')
-        publications = []
+    def _iter_listing_items(self, page_content, encoding='utf-8'):
+        """Yield the fields of each current-year publication item on a listing page"""
+        year = str(self.current_year)
+        if isinstance(page_content, str):
+            page_content, encoding = page_content.encode('utf-8'), 'utf-8'
+        if HTML_PARSER != 'lxml':
+            from bs4 import BeautifulSoup
+            
+            # Find publication items with class 'item' and data-time attribute for current year
+            soup = BeautifulSoup(page_content, HTML_PARSER, from_encoding=encoding)
+            for item in soup.find_all('div', class_='item', attrs={'data-time': year}):
+                time_element, link_element, h2_element = item.find('time'), item.find('a'), item.find('h2')
+                yield {
+                    'data-title': item.get('data-title', ''),
+                    'data-cat': item.get('data-cat', ''),
+                    'date': time_element.get_text(strip=True) if time_element else None,
+                    'url': link_element.get('href', '') if link_element else None,
+                    'h2': h2_element.get_text(strip=True) if h2_element else None
+                }
+            return
         
-        # Find publication items with class 'item' and data-time attribute for current year
-        publication_items = soup.find_all('div', class_='item', attrs={'data-time': str(self.current_year)})
+        # Stream the page instead of building a full tree; only the items are needed
+        from lxml import etree
+        for _, item in etree.iterparse(io.BytesIO(page_content), events=('end',), tag='div',
+                                       html=True, encoding=encoding):
+            if 'item' not in (item.get('class') or '').split() or item.get('data-time') != year:
+                continue
+            time_element, link_element, h2_element = item.find('.//time'), item.find('.//a'), item.find('.//h2')
+            yield {
+                'data-title': item.get('data-title', ''),
+                'data-cat': item.get('data-cat', ''),
+                'date': _element_text(time_element) if time_element is not None else None,
+                'url': link_element.get('href', '') if link_element is not None else None,
+                'h2': _element_text(h2_element) if h2_element is not None else None
+            }
+            # Drop the processed item and everything before it to keep memory flat
+            item.clear()
+            while item.getprevious() is not None:
+                del item.getparent()[0]
+    
+    async def extract_publications_from_page(self, page_content, base_url, encoding='utf-8'):
+        """Extract publication data from a publications page (raw bytes in ``encoding``, or text)"""
+        publication_items = list(self._iter_listing_items(page_content, encoding))
+        return await self._extract_publications_from_items(publication_items, base_url)
+    
+    def _detail_semaphore(self):
+        """Semaphore bounding concurrent detail-page fetches"""
+        return asyncio.Semaphore(max(1, self.config.get('scraper_settings.concurrency', 15)))
+    
+    async def _extract_publications_from_items(self, publication_items, base_url, semaphore=None):
+        """Build publications from listing items, merging in their detail pages"""
+        publications = []
         
         self._log(f"📋 Found {len(publication_items)} items for {self.current_year}", "detailed_extraction")
         
+        basic_publications = []
         for item in publication_items:
             try:
                 publication_data = self._extract_publication_from_item(item, base_url)
                 if publication_data:
-                    # Extract additional details from the publication's detail page
-                    if publication_data.get('url'):
-                        self._log(f"🔍 Extracting details from: {publication_data['url']}", "detailed_extraction")
-                        detailed_data = self.extract_publication_details(publication_data['url'])
-                        if detailed_data:
-                            # Merge detailed data with basic data
-                            publication_data.update(detailed_data)
-                    
-                    publications.append(publication_data)
-                    self._log(f"✅ Extracted: {publication_data['title'][:50]}...", "detailed_extraction")
-                    
+                    # Skip duplicates before paying for their detail page fetch
+                    if publication_data['url']:
+                        key = self._url_key(publication_data['url'])
+                    else:
+                        key = (publication_data['title'], publication_data['date'])
+                    if key in self._seen:
+                        continue
+                    self._seen.add(key)
+                    basic_publications.append(publication_data)
             except Exception as e:
                 self._log(f"⚠️  Error extracting publication: {e}", "detailed_extraction")
                 continue
         
+        # Fetch detail pages concurrently; network latency dominates each fetch
+        if semaphore is None:
+            semaphore = self._detail_semaphore()
+        all_details = await asyncio.gather(
+            *(self._fetch_publication_details(semaphore, publication_data)
+              for publication_data in basic_publications),
+            return_exceptions=True
+        )
+        
+        for publication_data, detailed_data in zip(basic_publications, all_details):
+            if isinstance(detailed_data, Exception):
+                self._log(f"⚠️  Error extracting details for {publication_data['url']}: {detailed_data}", "detailed_extraction")
+            elif detailed_data:
+                # Merge detailed data with basic data
+                publication_data.update(detailed_data)
+            
+            publications.append(publication_data)
+            self._log(f"✅ Extracted: {publication_data['title'][:50]}...", "detailed_extraction")
+        
         return publications
     
+    async def _fetch_publication_details(self, semaphore, publication_data):
+        """Extract additional details from the publication's detail page, if it has one"""
+        if not publication_data.get('url'):
+            return None
+        async with semaphore:
+            self._log(f"🔍 Extracting details from: {publication_data['url']}", "detailed_extraction")
+            return await self.extract_publication_details(publication_data['url'])
+    
     def _extract_publication_from_item(self, item, base_url):
-        """Extract publication data from a single item div"""
+        """Extract publication data from the fields of a single item div"""
         publication = {
             'title': '',
             'date': '',
@@ -179,17 +567,17 @@ class CourtOfAccountsScraper:
             'pdf_url': '',
             'pdf_filename': '',
             'url': '',
-            'scraped_at': datetime.now().isoformat(),
+            'scraped_at': self._scrape_ts,
             'source_url': base_url
         }
         
         # Extract title from data-title attribute
-        title = item.get('data-title', '').strip()
+        title = item['data-title'].strip()
         if title:
             publication['title'] = title
         
         # Extract category from data-cat attribute
-        category_attr = item.get('data-cat', '').strip()
+        category_attr = item['data-cat'].strip()
         if category_attr:
             # Convert category attribute to readable format
             category_map = {
@@ -205,211 +593,111 @@ class CourtOfAccountsScraper:
             publication['category'] = category_map.get(category_attr, category_attr)
         
         # Extract date from time element
-        time_element = item.find('time')
-        if time_element:
-            date_text = time_element.get_text(strip=True)
+        date_text = item['date']
+        if date_text is not None:
             publication['date'] = date_text
             
             # Extract year from date
-            import re
-            year_match = re.search(r'(\d{4})', date_text)
+            year_match = _YEAR_RE.search(date_text)
             if year_match:
                 publication['year'] = int(year_match.group(1))
             else:
                 publication['year'] = self.current_year  # Use current year as fallback
         
         # Extract URL from the link
-        link_element = item.find('a')
-        if link_element:
-            publication['url'] = link_element.get('href', '')
+        if item['url'] is not None:
+            publication['url'] = item['url']
         
         # Extract title from h2 element if not found in data-title
-        if not publication['title']:
-            h2_element = item.find('h2')
-            if h2_element:
-                publication['title'] = h2_element.get_text(strip=True)
+        if not publication['title'] and item['h2'] is not None:
+            publication['title'] = item['h2']
         
         # Look for PDF links in the item or try to find them on the detail page
         # For now, we'll leave PDF extraction for later as it requires visiting individual pages
         
         return publication if publication['title'] else None
     
-    def extract_publication_details(self, url):
-        """Extract detailed information from a publication's detail page"""
+    @staticmethod
+    def _url_key(url):
+        """Stable, compact 64-bit fingerprint of a URL for the seen set and detail cache"""
+        # Always blake2b (stdlib): detail_cache_file keys on disk must not depend on optional packages
+        return hashlib.blake2b(url.encode('utf-8'), digest_size=8).hexdigest()
+    
+    def _load_detail_cache(self):
+        """Load the on-disk detail cache, if there is one"""
+        try:
+            with open(self.detail_cache_file, 'r', encoding='utf-8') as f:
+                self._detail_cache = json.load(f)
+            self._log(f"📦 Loaded {len(self._detail_cache)} cached publication details", "progress")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self._log(f"⚠️  Error reading detail cache {self.detail_cache_file}: {e}", "progress")
+    
+    def _save_detail_cache(self):
+        """Write the detail cache to disk"""
+        try:
+            with open(self.detail_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self._detail_cache, f, ensure_ascii=False)
+        except Exception as e:
+            self._log(f"⚠️  Error saving detail cache {self.detail_cache_file}: {e}", "progress")
+    
+    async def extract_publication_details(self, url):
+        """Extract detailed information from a publication's detail page (memoized per URL)"""
+        key = self._url_key(url)
+        if key in self._detail_cache:
+            return self._detail_cache[key]
+        
+        # Concurrent requests for the same URL share one fetch
+        task = self._detail_tasks.get(key)
+        if task is None:
+            task = self._detail_tasks[key] = asyncio.ensure_future(self._fetch_publication_page_details(url))
+        try:
+            details = await task
+        finally:
+            self._detail_tasks.pop(key, None)
+        
+        if details is not None:
+            self._detail_cache[key] = details
+        return details
+    
+    async def _fetch_publication_page_details(self, url):
+        """Fetch and parse a publication's detail page"""
         try:
             self._log(f"📄 Fetching details from: {url}", "detailed_extraction")
             
-            response = self._make_request(url)
+            response = await self._afetch(url)
             if not response:
                 self._log(f"⚠️  Failed to fetch detail page: {url}", "detailed_extraction")
                 return None
-                
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            details = {
-                'description': '',
-                'author': '',
-                'pdf_files': [],
-                'additional_files': [],
-                'full_content': '',
-                'arabic_version_url': '',
-                'language_versions': {},
-                'publication_details': {}
-            }
-            
-            # Extract description from OpenGraph meta first, then content
-            og_description = soup.find('meta', property='og:description')
-            if og_description:
-                details['description'] = og_description.get('content', '').strip()
-            
-            # If no OG description, extract from article content
-            if not details['description']:
-                content_selectors = [
-                    '.entry-content',
-                    '.post-content', 
-                    '.article-content',
-                    '.content',
-                    'article .content',
-                    '.single-content'
-                ]
-                
-                for selector in content_selectors:
-                    content_elem = soup.select_one(selector)
-                    if content_elem:
-                        # Get text content, cleaning up whitespace
-                        content_text = content_elem.get_text(separator=' ', strip=True)
-                        # Take first 500 characters as description
-                        details['description'] = content_text[:500] + ('...' if len(content_text) > 500 else '')
-                        details['full_content'] = content_text
-                        break
-            
-            # Extract author information
-            author_section = soup.find('h3', string=re.compile(r'Auteur', re.IGNORECASE))
-            if author_section:
-                author_elem = author_section.find_next('p', class_='txtRougeP1')
-                if author_elem:
-                    details['author'] = author_elem.get_text(strip=True)
-            
-            # Extract language versions (Arabic, Amazigh, English)
-            language_links = soup.find_all('a', class_='wpml-ls-link')
-            for link in language_links:
-                lang_span = link.find('span', class_='wpml-ls-native')
-                if lang_span:
-                    lang_text = lang_span.get_text(strip=True)
-                    lang_url = link.get('href', '')
-                    
-                    if 'العربية' in lang_text or 'arabic' in lang_text.lower():
-                        details['arabic_version_url'] = lang_url
-                        details['language_versions']['arabic'] = {
-                            'name': lang_text,
-                            'url': lang_url
-                        }
-                    elif 'ⵜⴰⵎⴰⵣⵉⵖⵜ' in lang_text or 'amazigh' in lang_text.lower():
-                        details['language_versions']['amazigh'] = {
-                            'name': lang_text,
-                            'url': lang_url
-                        }
-                    elif 'english' in lang_text.lower() or 'anglais' in lang_text.lower():
-                        details['language_versions']['english'] = {
-                            'name': lang_text,
-                            'url': lang_url
-                        }
-            
-            # Extract PDF links from regular href attributes
-            pdf_links = soup.find_all('a', href=re.compile(r'\.pdf$', re.IGNORECASE))
-            other_file_links = soup.find_all('a', href=re.compile(r'\.(doc|docx|xls|xlsx|zip|rar)$', re.IGNORECASE))
-            
-            # Extract PDF links from JavaScript onclick functions (Court of Accounts specific)
-            onclick_elements = soup.find_all(attrs={'onclick': re.compile(r'open_doc\([\'"]([^\'"]*\.pdf)[\'"]', re.IGNORECASE)})
             
-            # Process regular PDF links
-            for link in pdf_links:
-                pdf_url = urljoin(url, link.get('href', ''))
-                pdf_text = link.get_text(strip=True)
-                file_info = {
-                    'url': pdf_url,
-                    'filename': pdf_url.split('/')[-1],
-                    'title': pdf_text or pdf_url.split('/')[-1],
-                    'type': 'pdf'
-                }
-                details['pdf_files'].append(file_info)
-            
-            # Process JavaScript onclick PDF links
-            for element in onclick_elements:
-                onclick_value = element.get('onclick', '')
-                pdf_match = re.search(r'open_doc\([\'"]([^\'"]*\.pdf)[\'"]', onclick_value, re.IGNORECASE)
-                if pdf_match:
-                    pdf_url = pdf_match.group(1)
-                    
-                    # Find the title from the same item container
-                    item_container = element.find_parent('div', class_='item')
-                    if item_container:
-                        title_elem = item_container.find('h2', class_='widthTitle')
-                        if title_elem:
-                            pdf_title = title_elem.get_text(strip=True)
-                        else:
-                            pdf_title = pdf_url.split('/')[-1]
-                    else:
-                        pdf_title = pdf_url.split('/')[-1]
-                    
-                    # Detect language and document type
-                    is_arabic = any(keyword in pdf_title.lower() for keyword in ['ar', 'arabe', 'arabic', 'عربي'])
-                    # Check both title and URL for synthesis indicators
-                    is_synthesis = (any(keyword in pdf_title.lower() for keyword in ['synthèse', 'synthese', 'synthesis', 'resume', 'summary']) or
-                                  any(keyword in pdf_url.lower() for keyword in ['synthese', 'synthèse']))
-                    is_french = 'fr' in pdf_title.lower() or 'français' in pdf_title.lower()
-                    
-                    file_info = {
-                        'url': pdf_url,
-                        'filename': pdf_url.split('/')[-1],
-                        'title': pdf_title,
-                        'type': 'pdf',
-                        'language': 'arabic' if is_arabic else ('french' if is_french else 'unknown'),
-                        'document_type': 'synthesis' if is_synthesis else 'main_report'
-                    }
-                    details['pdf_files'].append(file_info)
-            
-            # Process other files
-            for link in other_file_links:
-                file_url = urljoin(url, link.get('href', ''))
-                file_text = link.get_text(strip=True)
-                file_ext = file_url.split('.')[-1].lower()
-                file_info = {
-                    'url': file_url,
-                    'filename': file_url.split('/')[-1],
-                    'title': file_text or file_url.split('/')[-1],
-                    'type': file_ext
-                }
-                details['additional_files'].append(file_info)
-            
-            # Set main PDF if available
-            if details['pdf_files']:
-                main_pdf = details['pdf_files'][0]
-                details['pdf_url'] = main_pdf['url']
-                details['pdf_filename'] = main_pdf['filename']
-            
-            # Extract publication date or other metadata
-            date_patterns = [
-                r'(\d{1,2}\s+\w+\s+\d{4})',
-                r'(\d{4}-\d{2}-\d{2})',
-                r'(\d{2}/\d{2}/\d{4})'
-            ]
-            
-            page_text = soup.get_text()
-            for pattern in date_patterns:
-                match = re.search(pattern, page_text)
-                if match:
-                    details['publication_details']['extracted_date'] = match.group(1)
-                    break
+            details = await self._parse_details(response.content, url, response.encoding)
             
             self._log(f"📋 Extracted {len(details['pdf_files'])} PDF files and {len(details['additional_files'])} other files", "detailed_extraction")
-            
             return details
             
         except Exception as e:
             self._log(f"⚠️  Error extracting details from {url}: {e}", "detailed_extraction")
             return None
     
+    async def _parse_details(self, content, url, encoding):
+        """Parse a detail page in the process pool if one is enabled and usable, else in a thread"""
+        if self.parse_workers > 0:
+            try:
+                if self._parse_pool is None:
+                    self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._parse_pool, _parse_detail_html, content, url, encoding)
+            except (OSError, NotImplementedError, BrokenProcessPool) as e:
+                # e.g. AWS Lambda has no /dev/shm for multiprocessing's semaphores
+                self._log(f"⚠️  Process pool unavailable ({e}); parsing detail pages inline", "detailed_extraction")
+                self.parse_workers = 0
+                if self._parse_pool is not None:
+                    self._parse_pool.shutdown(wait=False, cancel_futures=True)
+                    self._parse_pool = None
+        # Off the event loop, so a scrape run inside the API doesn't stall its requests
+        return await asyncio.to_thread(_parse_detail_html, content, url, encoding)
+    
     def _extract_publication_data(self, item, soup, base_url):
         """Extract individual publication data"""
         publication = {
@@ -420,7 +708,7 @@ class CourtOfAccountsScraper:
             'description': '',
             'pdf_url': '',
             'pdf_filename': '',
-            'scraped_at': datetime.now().isoformat(),
+            'scraped_at': self._scrape_ts,
             'source_url': base_url
         }
         
@@ -428,7 +716,7 @@ class CourtOfAccountsScraper:
         # This will need to be refined based on the actual HTML structure
         
         # Extract date (format appears to be "DD MMM. YYYY")
-        date_match = re.search(r'(\d{1,2})\s+(\w+)\.\s+(\d{4})', str(item))
+        date_match = _LISTING_DATE_RE.search(str(item))
         if date_match:
             day, month_abbr, year = date_match.groups()
             publication['date'] = f"{day} {month_abbr}. {year}"
@@ -445,7 +733,7 @@ class CourtOfAccountsScraper:
                 break
         
         # Extract title (everything after the category)
-        title_match = re.search(r'-\s*(.+)$', text_content)
+        title_match = _TITLE_RE.search(text_content)
         if title_match:
             publication['title'] = title_match.group(1).strip()
         else:
@@ -453,7 +741,7 @@ class CourtOfAccountsScraper:
         
         # Look for PDF links
         if hasattr(item, 'find_all'):
-            pdf_links = item.find_all('a', href=re.compile(r'\.pdf$', re.I))
+            pdf_links = item.find_all('a', href=_PDF_RE)
             if pdf_links:
                 pdf_link = pdf_links[0]
                 publication['pdf_url'] = urljoin(base_url, pdf_link.get('href', ''))
@@ -466,6 +754,17 @@ class CourtOfAccountsScraper:
         return None
     
     def scrape_publications(self, max_pages=10):
+        """Scrape current year publications (blocking wrapper around ascrape_publications)"""
+        return asyncio.run(self._closing(self.ascrape_publications(max_pages)))
+    
+    async def _closing(self, coroutine):
+        """Await coroutine, then close the HTTP client (it is bound to this event loop)"""
+        try:
+            return await coroutine
+        finally:
+            await self.aclose()
+    
+    async def ascrape_publications(self, max_pages=10):
         """Scrape current year publications"""
         
         self._log("============================================================", "progress")
@@ -481,37 +780,61 @@ class CourtOfAccountsScraper:
         self._log("============================================================", "progress")
         
         all_publications = []
+        self._seen = set()
+        self._scrape_ts = datetime.now().isoformat()
         
         # Use the base publications URL without parameters first
         # We'll filter by year after scraping the data
         url = self.publications_url
         
-        # Since the site shows the same content on all pages, just scrape once
+        # The site currently shows the same content on all pages, so only the first page is
+        # scraped unless pagination is enabled; listing pages are then fetched concurrently
+        listing_urls = [url]
+        if self.config.get('scraper_settings.paginate', False):
+            listing_urls += [f"{url}?paged={page}" for page in range(2, max_pages + 1)]
+        
         try:
-            self._log(f"📄 Processing publications page...", "progress")
+            self._log(f"📄 Processing {len(listing_urls)} publications page(s)...", "progress")
             
-            response = self._make_request(url)
-            if not response:
+            responses = await asyncio.gather(*(self._afetch(page_url) for page_url in listing_urls),
+                                             return_exceptions=True)
+            if isinstance(responses[0], Exception):
+                raise responses[0]
+            if not responses[0]:
                 self._log(f"⚠️  Failed to fetch publications page", "progress")
                 return []
             
-            publications = self.extract_publications_from_page(response.text, self.base_url)
+            # Pages after a failed fetch are dropped, like pages past the end of the listing
+            for index, response in enumerate(responses):
+                if isinstance(response, Exception) or not response:
+                    self._log(f"⚠️  Failed to fetch publications page {listing_urls[index]}", "progress")
+                    responses = responses[:index]
+                    break
+            
+            # Stop at the first page with no current-year items (before de-duplication),
+            # so detail pages past the end of the listing are never fetched
+            page_items = []
+            for response in responses:
+                items = list(self._iter_listing_items(response.content, response.encoding))
+                if not items:
+                    break
+                page_items.append(items)
+            
+            # Pages share the seen set, so an item listed on several pages is fetched once,
+            # and one semaphore, so concurrency is bounded across all pages
+            semaphore = self._detail_semaphore()
+            page_publications = await asyncio.gather(
+                *(self._extract_publications_from_items(items, self.base_url, semaphore) for items in page_items)
+            )
+            
+            publications = [publication for page in page_publications for publication in page]
             
             if not publications:
                 self._log(f"📭 No publications found on page", "progress")
                 return []
             
-            # Remove duplicates based on title and date
-            seen_publications = set()
-            unique_publications = []
-            
-            for pub in publications:
-                pub_key = (pub['title'], pub['date'])
-                if pub_key not in seen_publications:
-                    seen_publications.add(pub_key)
-                    unique_publications.append(pub)
-            
-            all_publications = unique_publications
+            # Duplicates were already dropped before their detail pages were fetched
+            all_publications = publications
             self._log(f"✅ Found {len(all_publications)} unique publications for {self.current_year}", "progress")
                     
         except Exception as e:
@@ -519,14 +842,14 @@ class CourtOfAccountsScraper:
             return []
         
         self.results = all_publications
+        
+        if self.detail_cache_file:
+            await asyncio.to_thread(self._save_detail_cache)
+        
         return all_publications
     
-    def save_results(self, filename=None):
-        """Save results to JSON file"""
-        if not self.results:
-            self._log("❌ No results to save", "progress")
-            return False
-        
+    def _data_dir(self):
+        """Find (and create if needed) the data directory results are saved to"""
         # Try to find the correct data directory path
         current_dir = Path(__file__).parent
         possible_data_paths = [
@@ -549,10 +872,17 @@ class CourtOfAccountsScraper:
         
         # Create data directory if it doesn't exist
         os.makedirs(data_dir, exist_ok=True)
+        return data_dir
+    
+    def save_results(self, filename=None):
+        """Save results to JSON file"""
+        if not self.results:
+            self._log("❌ No results to save", "progress")
+            return False
         
+        data_dir = self._data_dir()
         if not filename:
-            current_year = datetime.now().year
-            filename = data_dir / f"court-accounts-publications-{current_year}.json"
+            filename = data_dir / f"court-accounts-publications-{self.current_year}.json"
         else:
             filename = data_dir / filename
         
@@ -568,8 +898,8 @@ class CourtOfAccountsScraper:
         }
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, ensure_ascii=False, indent=2)
+            with open(filename, 'wb') as f:
+                f.write(_json_dumps(output_data))
             
             self._log("💾 Saving results...", "progress")
             self._log(f"✅ Results saved to {filename}", "progress")
@@ -581,12 +911,41 @@ class CourtOfAccountsScraper:
             self._log(f"❌ Error saving results: {e}", "progress")
             return False
     
+    def save_results_jsonl(self, filename=None):
+        """Save results to a JSON Lines file, one publication per line"""
+        if not self.results:
+            self._log("❌ No results to save", "progress")
+            return False
+        
+        data_dir = self._data_dir()
+        if not filename:
+            filename = data_dir / f"court-accounts-publications-{self.current_year}.jsonl"
+        else:
+            filename = data_dir / filename
+        
+        try:
+            # Encode one record at a time instead of building the whole document in memory
+            with open(filename, 'wb') as f:
+                for publication in self.results:
+                    f.write(_json_line(publication))
+            
+            self._log(f"✅ Results saved to {filename}", "progress")
+            return True
+            
+        except Exception as e:
+            self._log(f"❌ Error saving results: {e}", "progress")
+            return False
+    
     def run(self, max_pages=10):
+        """Main execution method for current year publications (blocking wrapper around arun)"""
+        return asyncio.run(self._closing(self.arun(max_pages)))
+    
+    async def arun(self, max_pages=10):
         """Main execution method for current year publications"""
         try:
             # Check for existing data if not force re-scraping
             if not self.force_rescrape:
-                existing_count = self._check_existing_data()
+                existing_count = await asyncio.to_thread(self._check_existing_data)
                 if existing_count > 0:
                     self._log(f"✅ Data already exists with {existing_count} items!", "progress")
                     self._log("📋 Force re-scraping is disabled.", "progress")
@@ -594,15 +953,17 @@ class CourtOfAccountsScraper:
                     return True
             
             # Scrape publications
-            publications = self.scrape_publications(max_pages)
+            publications = await self.ascrape_publications(max_pages)
             
             if not publications:
                 self._log("📭 No publications found to process", "progress")
                 self._log("❌ No results found. Exiting.", "progress")
                 return False
             
-            # Save results
-            success = self.save_results()
+            # Save results (file IO stays off the event loop); the JSON file is what the API reads
+            success = await asyncio.to_thread(self.save_results)
+            if success and self.config.get('scraper_settings.save_format', 'json') == 'jsonl':
+                success = await asyncio.to_thread(self.save_results_jsonl)
             
             if success:
                 self._log("", "progress")
@@ -642,20 +1003,18 @@ class CourtOfAccountsScraper:
     
     def _check_existing_data(self):
         """Check if data already exists"""
-        current_year = datetime.now().year
-        
         # Try multiple possible paths for the data file
         possible_paths = [
-            f"data/court-accounts-publications-{current_year}.json",
-            f"../data/court-accounts-publications-{current_year}.json",
-            f"../../data/court-accounts-publications-{current_year}.json"
+            f"data/court-accounts-publications-{self.current_year}.json",
+            f"../data/court-accounts-publications-{self.current_year}.json",
+            f"../../data/court-accounts-publications-{self.current_year}.json"
         ]
         
         for filename in possible_paths:
             if os.path.exists(filename):
                 try:
-                    with open(filename, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                    with open(filename, 'rb') as f:
+                        data = _json_loads(f.read())
                         count = data.get('total_items', 0)
                         if self.enable_logs:
                             self._log(f"✅ Found existing data file: {filename} with {count} items", "progress")
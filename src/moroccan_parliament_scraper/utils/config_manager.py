@@ -21,6 +21,8 @@ class ConfigManager:
                 "force_rescrape": False,
                 "enable_logs": True,
                 "max_pages": 10,
+                "paginate": False,
+                "concurrency": 15,
                 "save_format": "json"
             },
             "proxy_settings": {
@@ -42,6 +44,8 @@ class ConfigManager:
                 "timeout": 30,
                 "retry_attempts": 3,
                 "delay_between_requests": 2,
+                "requests_per_second": 5,
+                "pool_maxsize": 10,
                 "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             },
             "logging_settings": {
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Scrape -> poll -> result flow of the Vercel API, with the network scrape stubbed out
+"""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(PROJECT_ROOT), str(PROJECT_ROOT / "src")]
+
+from fastapi.testclient import TestClient
+
+from moroccan_parliament_scraper.core.court_accounts_scraper import CourtOfAccountsScraper
+from api.main import app
+
+PUBLICATION = {
+    "title": "Rapport annuel 2025",
+    "category": "Rapport annuel",
+    "url": "https://www.courdescomptes.ma/publication/rapport-annuel-2025/",
+    "date": "12 Janv. 2025",
+    "year": 2025,
+}
+
+async def _fake_arun(self, max_pages=10):
+    """Stand-in for CourtOfAccountsScraper.arun that scrapes nothing over the network"""
+    self.results = [dict(PUBLICATION)]
+    return True
+
+def test_scrape_job_reports_its_result(monkeypatch):
+    """A scrape job is accepted, then its status carries the scrape's result"""
+    monkeypatch.setattr(CourtOfAccountsScraper, "arun", _fake_arun)
+    client = TestClient(app)
+    
+    response = client.post("/api/court-accounts/scrape", json={"max_pages": 1, "force_rescrape": True})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    
+    # TestClient runs the background task (which waits for the job) before returning
+    status = client.get("/api/court-accounts/status", params={"job_id": job_id})
+    assert status.status_code == 200
+    job = status.json()["details"]
+    assert job["job_id"] == job_id
+    assert job["status"] == "completed"
+    # The shape public/js/app.js reads once the job is no longer running
+    assert job["result"]["success"] is True
+    assert job["result"]["publications_count"] == 1
+    assert job["result"]["message"] == "Scraping completed successfully"
+
+def test_unknown_job_is_404():
+    """Polling a job id that was never issued is a 404"""
+    client = TestClient(app)
+    assert client.get("/api/court-accounts/status", params={"job_id": "missing"}).status_code == 404